@@ -0,0 +1,39 @@
+"""Time to encode a password, before and after cached derivations and integer tea.
+
+Run with ``PYTHONPATH=src:test/login_logic python benchmark/bench_encrypt.py``.
+"""
+
+import asyncio
+import base64
+import timeit
+
+from rsa import encrypt as rsa_encrypt
+from test_encrypt import SALT, legacy_plain
+
+from qqqr.up import encrypt
+from qqqr.up.encrypt import PUBKEY, TeaEncoder
+
+PASSWD = "password123"
+VCODE = "!ABC"
+
+
+def legacy():
+    enc = rsa_encrypt(legacy_plain(PASSWD, SALT, VCODE), PUBKEY)
+    return base64.b64encode(enc, b"*-").decode().replace("=", "_")
+
+
+if __name__ == "__main__":
+    n = 2000
+    encoder = TeaEncoder(PASSWD)
+    loop = asyncio.new_event_loop()
+    backend = "cryptography" if hasattr(encrypt, "_PUBKEY") else "rsa"
+
+    rows = {
+        "legacy tea": lambda: legacy_plain(PASSWD, SALT, VCODE),
+        "tea": lambda: encoder._plain(SALT, VCODE),
+        "legacy encode": legacy,
+        f"encode ({backend})": lambda: loop.run_until_complete(encoder.encode(SALT, VCODE)),
+    }
+    for name, f in rows.items():
+        cost = min(timeit.repeat(f, number=n, repeat=5)) / n * 1e6
+        print(f"{name:<24}{cost:>8.1f}us")
@@ -0,0 +1,43 @@
+"""Time to solve the Tcaptcha pow challenge: the former loop, chunked search in one thread and
+chunked search in a process pool.
+
+Run with ``PYTHONPATH=src python benchmark/bench_pow.py``.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import md5
+from time import perf_counter
+
+from qqqr.up.captcha.workload import solve_pow
+
+PREFIX = "0a1b2c3d4e5f6a7b8c9d#"
+
+
+def legacy(prefix: str, target: str):
+    """The loop before chunked search."""
+    nonce = prefix.encode()
+    cnt = 0
+    while md5(nonce + str(cnt).encode()).hexdigest() != target:
+        cnt += 1
+    return cnt
+
+
+def timed(f, *args, **kwds):
+    start = perf_counter()
+    f(*args, **kwds)
+    return (perf_counter() - start) * 1e3
+
+
+if __name__ == "__main__":
+    workers = os.cpu_count() or 1
+    print(f"cpu count: {workers}")
+    print(f"{'answer':>8}{'legacy(ms)':>12}{'chunked(ms)':>13}{'pool(ms)':>10}")
+    with ProcessPoolExecutor(workers) as executor:
+        solve_pow(PREFIX, md5(b"warm up").hexdigest(), timeout=0.1, executor=executor)
+        for ans in [10_000, 100_000, 300_000, 1_000_000]:
+            target = md5(f"{PREFIX}{ans}".encode()).hexdigest()
+            t0 = timed(legacy, PREFIX, target)
+            t1 = timed(solve_pow, PREFIX, target)
+            t2 = timed(solve_pow, PREFIX, target, executor=executor, workers=workers)
+            print(f"{ans:>8}{t0:>12.1f}{t1:>13.1f}{t2:>10.1f}")
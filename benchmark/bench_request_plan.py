@@ -0,0 +1,53 @@
+"""Call-preparation overhead of each api, before and after request plans.
+
+Run with ``PYTHONPATH=src python benchmark/bench_request_plan.py``.
+"""
+
+import timeit
+
+from yarl import URL
+
+from aioqzone.model.api import *
+
+UIN = 123456789
+
+
+def legacy(api: QzoneApi):
+    """Preparation before request plans: full dump, new headers and a new url every call."""
+    params = api.params
+    d = params.model_dump(mode="json", by_alias=True)
+    d.update({i: UIN for i in params.uin_fields})
+    headers = dict(Referer=api.referer)
+    if api.keep_alive:
+        headers["Connection"] = "keep-alive"
+    if api.accept:
+        headers["Accept"] = api.accept
+    return d, headers, URL(str(api.host)).with_path(api.path)
+
+
+def planned(api: QzoneApi):
+    return api.params.build_params(UIN), api.headers(), api.url
+
+
+cases = {
+    "index": IndexPageApi(),
+    "get_active_feeds": FeedPageApi(params=ActiveFeedsParams(attach_info="foo")),
+    "get_feeds": GetFeedsApi(params=GetFeedsParams(hostuin=UIN, attach_info="foo")),
+    "shuoshuo": ShuoshuoApi(params=ShuoshuoParams(fid="fid", uin=UIN)),
+    "mfeeds_get_count": GetCountApi(),
+    "dolike": LikeApi(params=DolikeParam(unikey="u", curkey="c", appid=311)),
+    "add_comment": AddCommentApi(
+        params=AddCommentParams(ownuin=UIN, fid="fid", private=0, content="foo")
+    ),
+    "publish_mood": PublishMoodApi(params=PublishMoodParams(content="foo")),
+    "upload_pic": UploadPicApi(params=UploadPicParams(picture=b"Zm9v", hd_height=1, hd_width=1)),
+}
+
+if __name__ == "__main__":
+    n = 20000
+    print(f"{'api':<18}{'legacy(us)':>12}{'planned(us)':>13}{'speedup':>9}")
+    for name, api in cases.items():
+        planned(api)  # warm up the plan cache
+        t0 = min(timeit.repeat(lambda: legacy(api), number=n, repeat=5)) / n * 1e6
+        t1 = min(timeit.repeat(lambda: planned(api), number=n, repeat=5)) / n * 1e6
+        print(f"{name:<18}{t0:>12.2f}{t1:>13.2f}{t0 / t1:>8.2f}x")
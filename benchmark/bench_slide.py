@@ -0,0 +1,25 @@
+"""Accuracy and latency of the built-in slide captcha solver on synthetic jigsaws.
+
+Run with ``PYTHONPATH=src:test/login_logic python benchmark/bench_slide.py``.
+"""
+
+from time import perf_counter
+
+from synthetic import jigsaw
+
+from qqqr.up.captcha.slide.solver import locate_gap
+
+N = 200
+TOLERANCE = 3
+
+if __name__ == "__main__":
+    print(f"{'dim':>5}{'accuracy':>10}{'mean(ms)':>10}{'max(ms)':>9}")
+    for dim in (0.2, 0.3, 0.4, 0.5):
+        hit, cost = 0, []
+        for seed in range(N):
+            bg, piece, init_pos, gap = jigsaw(seed, dim=dim)
+            start = perf_counter()
+            x = locate_gap(bg, piece, init_pos)
+            cost.append((perf_counter() - start) * 1e3)
+            hit += abs(x - gap) <= TOLERANCE
+        print(f"{dim:>5}{hit / N:>10.1%}{sum(cost) / N:>10.1f}{max(cost):>9.1f}")
@@ -1,10 +1,16 @@
+from .batch import BatchQrLogin
 from .h5 import QzoneH5API
+from .keeper import CookieKeeper
 from .login import *
 from .login._base import Loginable
+from .pool import AccountPool
 
 __all__ = [
     "QrLoginConfig",
     "UpLoginConfig",
     "Loginable",
     "QzoneH5API",
+    "AccountPool",
+    "BatchQrLogin",
+    "CookieKeeper",
 ]
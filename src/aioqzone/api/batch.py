@@ -0,0 +1,150 @@
+"""Login many accounts by QR concurrently.
+
+Every account logins with its own :class:`~aiohttp.ClientSession` from an
+:class:`~aioqzone.api.pool.AccountPool`, so QR flows never touch the cookies or headers of each
+other, while all of them share one connection pool.
+
+.. versionadded:: 1.8.2
+"""
+
+import asyncio
+import logging
+import typing as t
+from dataclasses import dataclass, field
+
+import aioqzone.message as MT
+from aioqzone.exception import LoginCooldown
+
+from .login import QrLoginConfig, QrLoginManager
+from .pool import Account, AccountPool
+
+log = logging.getLogger(__name__)
+
+__all__ = ["BatchLoginResult", "BatchQrLogin"]
+
+
+@dataclass
+class BatchLoginResult:
+    """Login result of one account in :meth:`BatchQrLogin.login`."""
+
+    uin: int
+    cookie: t.Dict[str, str] = field(default_factory=dict)
+    """The new cookie. Empty if login failed."""
+    error: t.Optional[BaseException] = None
+    """Why the login failed. :obj:`None` if success."""
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+class BatchQrLogin:
+    """Run QR login of many accounts concurrently.
+
+    .. code-block:: python
+
+        async with BatchQrLogin(concurrency=8) as batch:
+            batch.qr_fetched.add_impl(lambda uin, png, times: dashboard.show(uin, png))
+            async for r in batch.login(configs):
+                if r.success:
+                    save_cookie(r.uin, r.cookie)
+    """
+
+    def __init__(
+        self,
+        pool: t.Optional[AccountPool] = None,
+        *,
+        concurrency: int = 16,
+        h5: bool = True,
+    ) -> None:
+        """
+        :param pool: Accounts are added to this pool, so they are ready for jobs after login.
+            If not given, a pool is created and owned by the batch.
+        :param concurrency: Max QR sessions running at the same time.
+        :param h5: Use h5 login proxy.
+        """
+        super().__init__()
+        self._own_pool = pool is None
+        self.pool = pool or AccountPool()
+        self.concurrency = concurrency
+        self.h5 = h5
+        self.qr_fetched = MT.batch_qr_fetched()
+        """Emitted with the uin once a QR of any account is fetched."""
+        self._failed: t.Dict[int, "asyncio.Future[BaseException]"] = {}
+        self._hooked: t.Set[int] = set()
+
+    def add(self, config: QrLoginConfig) -> Account:
+        """Add an account into :obj:`.pool`, or get it if exists, and forward its events to this
+        batch.
+
+        :raise `TypeError`: if the account exists but does not login by QR.
+        """
+        if (account := self.pool.accounts.get(config.uin)) is None:
+            account = self.pool.add(lambda client: QrLoginManager(client, config, h5=self.h5))
+        login = account.login
+        if not isinstance(login, QrLoginManager):
+            raise TypeError(f"account {config.uin} does not login by QR")
+
+        uin = login.uin
+        if uin in self._hooked:
+            return account
+        self._hooked.add(uin)
+
+        async def _on_qr_fetched(png: t.Optional[bytes], times: int, qr_renew=False):
+            await self.qr_fetched.emit(uin, png, times)
+
+        def _on_login_failed(uin: int, exc: t.Union[BaseException, str]):
+            if (fut := self._failed.get(uin)) and not fut.done():
+                fut.set_result(exc if isinstance(exc, BaseException) else RuntimeError(exc))
+
+        login.qr_fetched.add_impl(_on_qr_fetched)
+        login.login_failed.add_impl(_on_login_failed)
+        return account
+
+    def cancel(self, uin: int) -> None:
+        """Cancel the QR login of an account."""
+        login = self.pool.accounts[uin].login
+        assert isinstance(login, QrLoginManager)
+        login.cancel_qr.set()
+
+    async def _login_one(self, account: Account, sem: asyncio.Semaphore) -> BatchLoginResult:
+        uin = account.uin
+        async with sem:
+            failed = self._failed[uin] = asyncio.get_event_loop().create_future()
+            try:
+                if await account.login.new_cookie():
+                    return BatchLoginResult(uin, account.login.cookie)
+                # new_cookie returns False on failure, and the error is emitted by login_failed.
+                return BatchLoginResult(uin, error=await failed)
+            except LoginCooldown as e:
+                return BatchLoginResult(uin, error=e)
+            finally:
+                self._failed.pop(uin, None)
+
+    async def login(self, configs: t.Iterable[QrLoginConfig]) -> t.AsyncIterator[BatchLoginResult]:
+        """Login all accounts in `configs`, at most :obj:`.concurrency` at the same time.
+        Results are yielded as soon as each account completes. Logins not completed are cancelled
+        if the iteration is stopped early.
+        """
+        sem = asyncio.Semaphore(self.concurrency)
+        accounts = {a.uin: a for a in map(self.add, configs)}
+        tasks = [asyncio.ensure_future(self._login_one(a, sem)) for a in accounts.values()]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                r = await fut
+                log.info(f"batch login of {r.uin}: {'success' if r.success else r.error!r}")
+                yield r
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def close(self) -> None:
+        """Close :obj:`.pool` if it is created by this batch."""
+        if self._own_pool:
+            await self.pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
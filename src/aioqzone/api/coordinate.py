@@ -0,0 +1,161 @@
+"""Share one login among processes.
+
+:meth:`Loginable.new_cookie` coalesces logins in one process with :class:`asyncio.Lock`.
+:class:`CoordinatedLoginMan` extends this to processes on one host: processes elect a leader with
+a lease in a sqlite database. The leader performs the actual login and saves the cookie into
+a :class:`~aioqzone.api.store.SqliteCookieStore`, others wait and pick up the cookie from it.
+If the leader dies, its lease expires and another process takes over.
+
+.. versionadded:: 1.8.2
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import typing as t
+from time import time
+
+from .login._base import Loginable
+from .store import SqliteCookieStore, StoredCookie
+
+log = logging.getLogger(__name__)
+
+__all__ = ["SqliteLoginLease", "CoordinatedLoginMan"]
+
+
+class SqliteLoginLease:
+    """A per-uin lease saved in sqlite. A lease is held by one owner until it expires
+    or is released."""
+
+    def __init__(self, store: SqliteCookieStore, table: str = "login_lease", ttl: float = 30):
+        """
+        :param store: the lease table is created in the database of this store.
+        :param ttl: lease expires after so many seconds unless it is renewed.
+        """
+        self.store = store
+        self.table = table
+        self.ttl = ttl
+        with store.connect() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(uin INTEGER PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+
+    def acquire(self, uin: int, owner: str) -> bool:
+        """Acquire or renew the lease. This is atomic among processes.
+
+        :return: whether the lease is held by `owner` now.
+        """
+        now = time()
+        with self.store.connect() as conn:
+            cur = conn.execute(
+                f"INSERT INTO {self.table} (uin, owner, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT(uin) DO UPDATE SET owner = excluded.owner, expires = excluded.expires "
+                f"WHERE {self.table}.expires < ? OR {self.table}.owner = excluded.owner",
+                (uin, owner, now + self.ttl, now),
+            )
+            return cur.rowcount == 1
+
+    def release(self, uin: int, owner: str) -> None:
+        with self.store.connect() as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE uin = ? AND owner = ?", (uin, owner))
+
+
+class CoordinatedLoginMan(Loginable):
+    """Wrap a login manager so that processes on the host share its login.
+
+    Hooks such as :obj:`login_success` are emitted by this wrapper. Interaction hooks
+    (captcha, sms, qrcode) should still be registered on the wrapped manager.
+    """
+
+    def __init__(
+        self,
+        inner: Loginable,
+        store: SqliteCookieStore,
+        *,
+        lease_ttl: float = 30,
+        wait_timeout: float = 300,
+        poll_interval: float = 1,
+    ) -> None:
+        """
+        :param inner: the login manager which performs the actual login.
+        :param store: the shared cookie store.
+        :param lease_ttl: leader lease expires after so many seconds without renewal.
+        :param wait_timeout: max seconds to wait for a login, either as leader or follower.
+        :param poll_interval: followers check the store every so many seconds.
+        """
+        super().__init__(inner.uin, ch_login_notify=inner.ch_login_notify)
+        self.inner = inner
+        self.store = store
+        self.lease = SqliteLoginLease(store, ttl=lease_ttl)
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{id(self)}"
+        self.cookie = inner.cookie
+        self._cookie_time = 0.0
+        """saved time of current cookie, 0 if unknown. Stored cookies newer than this are picked
+        up."""
+
+    async def _run(self, func: t.Callable[..., t.Any], *args):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+    async def _pick_up(self, since: float) -> t.Optional[StoredCookie]:
+        stored = await self._run(self.store.load, self.uin)
+        if stored is not None and stored.saved_at > since:
+            return stored
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease.ttl / 3)
+            if not await self._run(self.lease.acquire, self.uin, self.owner):
+                log.warning(f"lost login lease of {self.uin}")
+
+    async def _lead(self) -> StoredCookie:
+        heartbeat = asyncio.ensure_future(self._heartbeat())
+        try:
+            cookie = await self.inner._new_cookie()
+            self.inner.cookie = cookie
+            stored = StoredCookie(cookie, time())
+            # save before releasing the lease, so followers can find it.
+            await self._run(self.store.save, self.uin, stored)
+            return stored
+        finally:
+            heartbeat.cancel()
+            await self._run(self.lease.release, self.uin, self.owner)
+
+    async def _new_cookie(self) -> t.Dict[str, str]:
+        """Login as the leader, or wait for the leader.
+
+        :raise `asyncio.TimeoutError`: if no cookie is got in :obj:`.wait_timeout`.
+        :raise: exceptions raised by the wrapped manager, if this process is the leader.
+        """
+        start = time()
+        deadline = start + self.wait_timeout
+        # The stored cookie may be the very one which expires. If the saved time of the current
+        # cookie is unknown, only cookies saved after this relogin starts are accepted.
+        since = self._cookie_time or start
+        leading = False
+        while time() < deadline:
+            if await self._run(self.lease.acquire, self.uin, self.owner):
+                # the former leader may have finished just before we got the lease.
+                if (stored := await self._pick_up(since)) is None:
+                    log.debug(f"{self.owner} leads the login of {self.uin}")
+                    leading = True
+                    stored = await asyncio.wait_for(
+                        self._lead(), timeout=max(deadline - time(), 0)
+                    )
+                else:
+                    await self._run(self.lease.release, self.uin, self.owner)
+            else:
+                stored = await self._pick_up(since)
+
+            if stored is not None:
+                if not leading:
+                    log.debug(f"{self.owner} picked up cookie of {self.uin}")
+                self._cookie_time = stored.saved_at
+                return stored.cookie
+            await asyncio.sleep(self.poll_interval)
+
+        raise asyncio.TimeoutError
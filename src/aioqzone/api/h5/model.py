@@ -1,7 +1,8 @@
+import asyncio
 import logging
 
 from pydantic import ValidationError
-from tenacity import AsyncRetrying, TryAgain, after_log, stop_after_attempt
+from tenacity import AsyncRetrying, RetryError, TryAgain, after_log, stop_after_attempt
 
 from aioqzone.api.login import Loginable
 from aioqzone.model.api import *
@@ -29,22 +30,31 @@ class QzoneH5API:
             after=after_log(log, logging.INFO),
             sleep=self._retry_sleep,
         )
-        """A decorator which will relogin and retry given func if cookie expired.
+        """The retry policy which will relogin and retry if cookie expired.
 
         'cookie expired' is indicated by:
 
         - `aioqzone.exception.QzoneError` code -3000/-10000
         - HTTP response code 302/403
 
-        .. note:: Decorate code as less as possible
-        .. warning::
+        .. versionchanged:: 1.8.2
 
-                You *SHOULD* **NOT** wrap a function with mutable input. If you change the mutable
-                var in the first attempt, in the second attempt the var saves the changed value.
+            This is a template now. :meth:`.call` iterates a copy of it, so that concurrent calls
+            never share attempt states.
         """
+        self._gate = asyncio.Event()
+        self._gate.set()
+        """Requests are sent only when the gate is open. It is closed during relogin."""
         self.qzone_tokens = {}
 
-    async def call(self, api: QzoneApi[TyRequest, TyResponse]) -> TyResponse:
+    async def call(
+        self, api: QzoneApi[TyRequest, TyResponse], *, relogin: bool = True
+    ) -> TyResponse:
+        """Send the request of an api and parse its response.
+
+        :param relogin: relogin and retry if login expired. If :obj:`False`, a :exc:`RetryError`
+            is raised once login expiration is detected.
+        """
         params: t.Dict[str, t.Any] = api.params.build_params(self.login.uin)
         if api.http_method == "GET":
             data = None
@@ -52,18 +62,28 @@ class QzoneH5API:
             data = params
             params = {}
 
-        headers = dict(Referer=api.referer)
-        if api.keep_alive:
-            headers["Connection"] = "keep-alive"
-        if api.accept:
-            headers["Accept"] = api.accept
+        headers = api.headers()
+
+        used_generation = 0
+
+        async def relogin_sleep(_) -> None:
+            await self._relogin(used_generation)
+
+        # AsyncRetrying saves its attempt state on the instance. Copy it for each call.
+        if relogin:
+            retrying = self._relogin_retry.copy(sleep=relogin_sleep)
+        else:
+            retrying = self._relogin_retry.copy(stop=stop_after_attempt(1))
 
-        async for attempt in self._relogin_retry:
+        async for attempt in retrying:
             with attempt:
-                if (gtk := self.login.gtk) == 0:
+                await self._wait_gate()
+                signing = self.login.signing
+                used_generation = signing.generation
+                if signing.gtk == 0:
                     raise TryAgain("no login state")
                 if api.attach_token:
-                    params["g_tk"] = gtk
+                    params["g_tk"] = signing.gtk
                     hostuin: int = getattr(api.params, "hostuin", self.login.uin)
                     if qzonetoken := self.qzone_tokens.get(hostuin):
                         params["qzonetoken"] = qzonetoken
@@ -74,7 +94,7 @@ class QzoneH5API:
                     params=params,
                     data=data,
                     headers=headers,
-                    cookies=self.login.cookie,
+                    cookies=signing.cookies,
                 ) as r:
                     r.raise_for_status()
                     obj = await api.response.response_to_object(r)
@@ -86,8 +106,52 @@ class QzoneH5API:
         else:
             raise AssertionError
 
+    async def _wait_gate(self) -> None:
+        if self._gate.is_set():
+            return
+        # requests waiting for the relogin raise the priority of this account in the scheduler.
+        self.login.waiting += 1
+        try:
+            await self._gate.wait()
+        finally:
+            self.login.waiting -= 1
+
     async def _retry_sleep(self, *_) -> None:
-        await self.login.new_cookie()
+        await self._relogin(self.login.generation)
+
+    async def _relogin(self, generation: int) -> None:
+        """Called when the cookie of `generation` is found expired.
+
+        The first caller closes the gate and relogins, so that new requests wait for the new
+        cookie instead of being sent with the expired one. Other callers wait for the gate.
+        If a newer cookie is already available, this returns at once to replay the request.
+        """
+        if self.login.generation != generation:
+            return
+        if not self._gate.is_set():
+            await self._wait_gate()
+            return
+
+        self._gate.clear()
+        try:
+            await self.login.new_cookie()
+        finally:
+            self._gate.set()
+
+    async def validate_cookie(self) -> bool:
+        """Check if current cookie is still valid by calling :meth:`.mfeeds_get_count`.
+        This is cheap and never triggers a relogin.
+
+        :raise: errors other than login expiration are raised as is.
+        :return: whether the cookie is valid.
+
+        .. versionadded:: 1.8.2
+        """
+        try:
+            await self.call(GetCountApi(), relogin=False)
+        except RetryError:
+            return False
+        return True
 
     async def index(self) -> IndexPageResp:
         """This api is the redirect page after h5 login, which is also the landing (main) page of h5 qzone.
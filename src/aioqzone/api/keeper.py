@@ -0,0 +1,169 @@
+"""Refresh cookie in background before it expires.
+
+.. versionadded:: 1.8.2
+"""
+
+import asyncio
+import logging
+import typing as t
+from collections import deque
+from contextlib import suppress
+from time import time
+
+from aioqzone.exception import LoginCooldown
+
+from .h5 import QzoneH5API
+
+log = logging.getLogger(__name__)
+
+__all__ = ["CookieKeeper"]
+
+
+class CookieKeeper:
+    """Keep the cookie of a :class:`~aioqzone.api.Loginable` alive.
+
+    The keeper probes the cookie with :meth:`QzoneH5API.validate_cookie` periodically.
+    Once a cookie is found expired, its age is recorded as an observed lifetime.
+    When the current cookie is approaching the learned lifetime, the keeper relogins
+    in background. The old cookie keeps serving requests until the new one arrives, since
+    :meth:`Loginable.new_cookie` only replaces the cookie on success.
+
+    .. code-block:: python
+
+        keeper = CookieKeeper(api)
+        keeper.start()
+        ...
+        await keeper.stop()
+    """
+
+    def __init__(
+        self,
+        api: QzoneH5API,
+        *,
+        probe_interval: float = 600,
+        min_interval: float = 30,
+        refresh_ratio: float = 0.8,
+        lifetime: t.Optional[float] = None,
+        history: int = 8,
+    ) -> None:
+        """
+        :param api: api used to probe the cookie. Its :obj:`~QzoneH5API.login` will be kept.
+        :param probe_interval: max interval between two probes, in seconds.
+        :param min_interval: min interval between two probes or failed relogins, in seconds.
+        :param refresh_ratio: relogin when cookie age exceeds this ratio of the learned lifetime.
+        :param lifetime: initial guess of cookie lifetime, in seconds.
+        :param history: how many observed lifetimes are remembered.
+        """
+        super().__init__()
+        self.api = api
+        self.login = api.login
+        self.probe_interval = probe_interval
+        self.min_interval = min_interval
+        self.refresh_ratio = refresh_ratio
+        self.lifetimes: t.Deque[float] = deque(maxlen=history)
+        """Observed cookie lifetimes, in seconds."""
+        if lifetime:
+            self.lifetimes.append(lifetime)
+
+        self.cookie_born = self.login.last_login or time()
+        """Timestamp when current cookie is received."""
+        self._valid_age = 0.0
+        self._task: t.Optional[asyncio.Task] = None
+        self.login.login_success.add_impl(self._on_login_success)
+
+    def _on_login_success(self, uin: int):
+        self.cookie_born = time()
+        self._valid_age = 0.0
+
+    @property
+    def cookie_age(self) -> float:
+        """Seconds since current cookie is received."""
+        return time() - self.cookie_born
+
+    @property
+    def lifetime(self) -> t.Optional[float]:
+        """The learned cookie lifetime. This is the shortest observed one, to be conservative.
+        :obj:`None` if no lifetime is observed yet.
+        """
+        if self.lifetimes:
+            return min(self.lifetimes)
+
+    def observe_expired(self) -> None:
+        """Record an expiration of current cookie.
+
+        The cookie expired between the last valid probe and now, so the age of last valid probe
+        is a lower bound of its lifetime. It is recorded to avoid refreshing too late.
+        """
+        lifetime = self._valid_age or self.cookie_age
+        if lifetime > 0:
+            self.lifetimes.append(lifetime)
+            log.debug(f"cookie of {self.login.uin} expired after {lifetime:.0f}s")
+
+    def should_refresh(self) -> bool:
+        lifetime = self.lifetime
+        return lifetime is not None and self.cookie_age >= lifetime * self.refresh_ratio
+
+    def next_delay(self) -> float:
+        """Seconds to wait before next check."""
+        delay = self.probe_interval
+        if (lifetime := self.lifetime) is not None:
+            delay = min(delay, lifetime * self.refresh_ratio - self.cookie_age)
+        return max(delay, self.min_interval)
+
+    async def probe(self) -> bool:
+        """Probe if current cookie is valid. An expiration is recorded if it is invalid."""
+        age = self.cookie_age
+        if await self.api.validate_cookie():
+            self._valid_age = age
+            return True
+        self.observe_expired()
+        return False
+
+    async def refresh(self) -> bool:
+        """Relogin in background. Current cookie is still used until the new one is received."""
+        log.info(f"refreshing cookie of {self.login.uin} (age={self.cookie_age:.0f}s)")
+        try:
+            return await self.login.new_cookie()
+        except LoginCooldown as e:
+            log.info(f"skip refreshing: {e}")
+            return False
+
+    async def tick(self) -> None:
+        """Run one check: refresh if the cookie is about to expire, otherwise probe it."""
+        if self.should_refresh() or not await self.probe():
+            if not await self.refresh():
+                log.warning(f"failed to refresh cookie of {self.login.uin}")
+
+    async def run(self) -> None:
+        """Check the cookie forever."""
+        while True:
+            await asyncio.sleep(self.next_delay())
+            try:
+                await self.tick()
+            except asyncio.CancelledError:
+                raise
+            except BaseException:
+                log.error("cookie keeper error", exc_info=True)
+
+    def start(self) -> "asyncio.Task[None]":
+        """Start :meth:`.run` as a background task."""
+        if self._on_login_success not in self.login.login_success.impls:
+            self.login.login_success.add_impl(self._on_login_success)
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop the background task, and stop tracking logins of :obj:`.login` until the next
+        :meth:`.start`.
+        """
+        with suppress(ValueError):
+            self.login.login_success.impls.remove(self._on_login_success)
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -6,6 +6,7 @@ Users can inherit these managers and implement their own persistance logic.
 import asyncio
 import logging
 import typing as t
+from contextlib import contextmanager, nullcontext
 
 from aiohttp import ClientError
 from tenacity import TryAgain, retry, retry_if_exception_type, stop_after_attempt, wait_exponential
@@ -13,11 +14,15 @@ from tylisten import FutureStore
 
 from aioqzone.exception import UnexpectedLoginError
 from aioqzone.model import QrLoginConfig, UpLoginConfig
+from qqqr.constant import UA
 from qqqr.exception import TencentLoginError, UnexpectedInteraction, UserBreak
 from qqqr.qr import QrLogin
-from qqqr.utils.net import ClientAdapter
+from qqqr.utils.net import ClientAdapter, use_mobile_ua
 
 from ._base import Loginable
+from .chain import ChainLoginMan, LoginTier, cookie_probe
+from .path import PathSelector
+from .scheduler import LoginScheduler
 
 log = logging.getLogger(__name__)
 
@@ -27,9 +32,35 @@ __all__ = [
     "QrLoginManager",
     "QrLoginConfig",
     "UpLoginConfig",
+    "PathSelector",
+    "ChainLoginMan",
+    "LoginTier",
+    "LoginScheduler",
 ]
 
 
+@contextmanager
+def _use_path(man: t.Union["UpLoginManager", "QrLoginManager"], h5: bool):
+    """Switch `man` to the `h5` login path and use the user agent of the path within the context.
+    The client is shared with API calls, so its former user agent is restored afterwards."""
+    client = man.client
+    former = client.headers.get("User-Agent")
+    if h5 != man.h5_enabled:
+        log.debug(f"{man.uin} switches to {'h5' if h5 else 'web'} login path")
+        man.h5(h5, clear_cookie=False)
+    if h5:
+        use_mobile_ua(client)
+    else:
+        client.headers["User-Agent"] = UA
+    try:
+        yield
+    finally:
+        if former is None:
+            client.headers.pop("User-Agent", None)
+        else:
+            client.headers["User-Agent"] = former
+
+
 class ConstLoginMan(Loginable):
     """A basic login manager which uses external provided cookie."""
 
@@ -55,10 +86,20 @@ class UpLoginManager(Loginable):
         *,
         h5=True,
         ch_login_notify: t.Optional[FutureStore] = None,
+        path_selector: t.Optional[PathSelector] = None,
     ) -> None:
+        """
+        :param h5: use h5 login path. Ignored once `path_selector` is given.
+        :param path_selector: choose h5 or web login path automatically before each login.
+
+        .. versionchanged:: 1.8.2
+
+            Add `path_selector`.
+        """
         super().__init__(config.uin, ch_login_notify=ch_login_notify)
         self.client = client
         self.config = config
+        self.path_selector = path_selector
         self.h5(h5, clear_cookie=False)  # init uplogin
 
     @retry(
@@ -79,8 +120,16 @@ class UpLoginManager(Loginable):
 
         :return: cookie dict
         """
+        if (selector := self.path_selector) is not None:
+            h5 = selector.choose()
+            path = _use_path(self, h5)
+            observe = selector.observe(h5, lambda: self.uplogin.captcha_count)
+        else:
+            path = observe = nullcontext()
+
         try:
-            cookie = await self.uplogin.login()
+            with path, observe:
+                cookie = await self.uplogin.login()
         except TencentLoginError as e:
             if e.code in (-3000, -10000):
                 raise TryAgain from e
@@ -93,6 +142,8 @@ class UpLoginManager(Loginable):
             log.warning(f"密码登录：{type(e).__name__}，重试", exc_info=True)
             log.debug(e.args, extra=e.__dict__)
             raise TryAgain from e
+        except asyncio.CancelledError:
+            raise
         except BaseException as e:
             log.fatal("密码登录异常", exc_info=True)
             raise UnexpectedLoginError from e
@@ -104,11 +155,18 @@ class UpLoginManager(Loginable):
 
         :param enable: use h5 mode or not
         :param clear_cookie: remove existing login cookie in :obj:`~Loginable.cookie`!
+            Cookie jar of :obj:`.client` is also cleared, so do not share the client among
+            accounts. Use :class:`~aioqzone.api.pool.AccountPool` to share connections instead.
+
+        .. versionchanged:: 1.8.2
+
+            Hooks of the former :obj:`.uplogin` are kept, so are their impls.
         """
         if clear_cookie:
-            self.cookie.clear()
+            self.cookie = {}
             self.client.cookie_jar.clear()
 
+        old = getattr(self, "uplogin", None)
         if enable:
             from qqqr.up import UpH5Login as cls
         else:
@@ -120,10 +178,23 @@ class UpLoginManager(Loginable):
             pwd=self.config.pwd.get_secret_value(),
             fake_ip=self.config.fake_ip and str(self.config.fake_ip),
             h5=enable,
+            prefetch_captcha=self.config.prefetch_captcha,
+            race_hooks=self.config.race_hooks,
         )
+        self.h5_enabled = enable
+        if old is not None:
+            self.uplogin.sms_code_input = old.sms_code_input
+            captcha, old_captcha = self.uplogin.captcha, old.captcha
+            captcha.solve_select_captcha = old_captcha.solve_select_captcha
+            captcha.solve_slide_captcha = old_captcha.solve_slide_captcha
+            captcha.solve_select_captcha_image = old_captcha.solve_select_captcha_image
+            captcha.solve_slide_captcha_image = old_captcha.solve_slide_captcha_image
+
         self.sms_code_input = self.uplogin.sms_code_input
         self.solve_select_captcha = self.uplogin.captcha.solve_select_captcha
         self.solve_slide_captcha = self.uplogin.captcha.solve_slide_captcha
+        self.solve_select_captcha_image = self.uplogin.captcha.solve_select_captcha_image
+        self.solve_slide_captcha_image = self.uplogin.captcha.solve_slide_captcha_image
 
 
 class QrLoginManager(Loginable):
@@ -134,10 +205,20 @@ class QrLoginManager(Loginable):
         *,
         h5=True,
         ch_login_notify: t.Optional[FutureStore] = None,
+        path_selector: t.Optional[PathSelector] = None,
     ) -> None:
+        """
+        :param h5: use h5 login path. Ignored once `path_selector` is given.
+        :param path_selector: choose h5 or web login path automatically before each login.
+
+        .. versionchanged:: 1.8.2
+
+            Add `path_selector`.
+        """
         super().__init__(config.uin, ch_login_notify=ch_login_notify)
         self.client = client
         self.config = config
+        self.path_selector = path_selector
         self.h5(h5, clear_cookie=False)  # init uplogin
 
     async def _new_cookie(self) -> t.Dict[str, str]:
@@ -152,13 +233,28 @@ class QrLoginManager(Loginable):
 
         :return: cookie dict
         """
+        if (selector := self.path_selector) is not None:
+            h5 = selector.choose()
+            path = _use_path(self, h5)
+            observe = selector.observe(h5)
+        else:
+            path = observe = nullcontext()
+
         try:
-            cookie = await self.qrlogin.login(
-                refresh_times=self.config.max_refresh_times, poll_freq=self.config.poll_freq
-            )
+            with path, observe:
+                cookie = await self.qrlogin.login(
+                    refresh_times=self.config.max_refresh_times,
+                    poll_freq=self.config.poll_freq,
+                    fast_poll_freq=self.config.fast_poll_freq,
+                    fast_period=self.config.fast_period,
+                    qr_lifetime=self.config.qr_lifetime,
+                )
         except UnexpectedInteraction:
             raise
-        except (KeyboardInterrupt, asyncio.CancelledError) as e:
+        except asyncio.CancelledError:
+            # e.g. a login tier exceeds its budget. It is not a user break.
+            raise
+        except KeyboardInterrupt as e:
             raise UserBreak from e
         except (GeneratorExit, ClientError) as e:
             log.warning(f"二维码登录：{type(e).__name__}，重试", exc_info=True)
@@ -175,14 +271,29 @@ class QrLoginManager(Loginable):
 
         :param enable: use h5 mode or not
         :param clear_cookie: remove existing login cookie in :obj:`~Loginable.cookie`!
+            Cookie jar of :obj:`.client` is also cleared, so do not share the client among
+            accounts. Use :class:`~aioqzone.api.pool.AccountPool` to share connections instead.
+
+        .. versionchanged:: 1.8.2
+
+            Hooks and events of the former :obj:`.qrlogin` are kept.
         """
         if clear_cookie:
-            self.cookie.clear()
+            self.cookie = {}
             self.client.cookie_jar.clear()
 
+        old = getattr(self, "qrlogin", None)
         self.qrlogin = QrLogin(client=self.client, uin=self.uin, h5=enable)
+        self.h5_enabled = enable
+        if old is not None:
+            self.qrlogin.qr_fetched = old.qr_fetched
+            self.qrlogin.qr_cancelled = old.qr_cancelled
+            self.qrlogin.cancel = old.cancel
+            self.qrlogin.refresh = old.refresh
+            self.qrlogin.ch_qr_notify = old.ch_qr_notify
 
         self.qr_fetched = self.qrlogin.qr_fetched
         self.qr_cancelled = self.qrlogin.qr_cancelled
         self.cancel_qr = self.qrlogin.cancel
         self.refresh_qr = self.qrlogin.refresh
+        self.ch_qr_notify = self.qrlogin.ch_qr_notify
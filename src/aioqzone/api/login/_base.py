@@ -1,27 +1,111 @@
 import asyncio
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from time import time
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 
 from tylisten import FutureStore
 
 import aioqzone.message as MT
+from aioqzone.exception import LoginCooldown
+from qqqr.exception import TencentLoginError
 from qqqr.utils.encrypt import gtk
 
+from .scheduler import LoginScheduler
+
+
+@dataclass(frozen=True)
+class SigningContext:
+    """Everything derived from a cookie that is needed to sign a request.
+    It is built once per cookie, see :obj:`Loginable.signing`.
+
+    .. versionadded:: 1.8.2
+    """
+
+    gtk: int
+    """g_token of the cookie. ``0`` denotes no existing login."""
+    cookies: Mapping[str, str]
+    """A read-only copy of the cookie. It is passed to aiohttp as per-request cookies, which
+    take precedence over cookies of the same name in the session jar.
+
+    A prebuilt ``Cookie`` header is not used: aiohttp merges jar cookies over an explicit
+    header, and the jar is shared with login flows, so a stale value in the jar would win.
+    aiohttp still builds the cookie morsels for each request."""
+    generation: int
+    """Increases every time the cookie is replaced."""
+
+    @classmethod
+    def build(cls, cookie: Dict[str, str], generation: int):
+        skey = cookie.get("p_skey") or cookie.get("skey")
+        return cls(
+            gtk=0 if skey is None else gtk(skey),
+            cookies=MappingProxyType(dict(cookie)),
+            generation=generation,
+        )
+
+
+@dataclass(frozen=True)
+class CooldownPolicy:
+    """Cooldown after failed logins. The n-th consecutive failure of the same class cools down
+    ``min(base * factor ** (n - 1), max)`` seconds.
+
+    .. versionadded:: 1.8.2
+    """
+
+    base: float = 10
+    factor: float = 2
+    max: float = 600
+
+    def cooldown(self, failures: int) -> float:
+        return min(self.base * self.factor ** (failures - 1), self.max)
+
+    @staticmethod
+    def failure_class(exc: BaseException) -> str:
+        """Classify a login failure. Login errors are classified by their code."""
+        if isinstance(exc, TencentLoginError):
+            return f"{type(exc).__name__}({exc.code})"
+        return type(exc).__name__
+
 
 class Loginable(ABC):
     """Abstract class represents a login manager."""
 
     last_login: float = 0
     """Last login time stamp. 0 represents no login since created."""
+    cooldown_policy: Optional[CooldownPolicy] = None
+    """Cooldown policy after failed logins. Cooldown is opt-in: the default :obj:`None` disables
+    it. Set e.g. ``CooldownPolicy()`` on a manager or a subclass to enable it.
+
+    .. versionadded:: 1.8.2
+    """
+    cooldown_until: float = 0
+    """Timestamp until which login is not allowed.
+
+    .. versionadded:: 1.8.2
+    """
+    scheduler: Optional[LoginScheduler] = None
+    """Logins wait for admission of this scheduler. Set it on :class:`Loginable` to share one
+    scheduler among all accounts in the process. :obj:`None` admits logins at once.
+
+    .. versionadded:: 1.8.2
+    """
 
     def __init__(self, uin: int, ch_login_notify: Optional[FutureStore] = None) -> None:
         super().__init__()
         self.uin = uin
-        self.cookie: Dict[str, str] = {}
-        """Cached cookie."""
+        self._cookie: Dict[str, str] = {}
+        self._generation = 0
+        self._signing: Optional[SigningContext] = None
         self.lock = asyncio.Lock()
+        self._failures: Dict[str, int] = {}
+        self._last_failure = ""
         self.ch_login_notify = ch_login_notify or FutureStore()
+        self.waiting = 0
+        """Number of requests waiting for the running login. See :obj:`.scheduler`.
+
+        .. versionadded:: 1.8.2
+        """
 
         self.login_success = MT.login_success()
         self.login_failed = MT.login_failed()
@@ -43,26 +127,98 @@ class Loginable(ABC):
         an actual login at the same time, other requests will block until the first is complete
         and share the cookie from this single login.
 
+        If a login fails and :obj:`.cooldown_policy` is set, further logins are refused for
+        a while according to it, to avoid hammering Qzone with doomed logins.
+
+        :raise `LoginCooldown`: if login is cooling down.
+        :raise `asyncio.CancelledError`: if the login is cancelled. This is neither reported by
+            :obj:`.login_failed` nor counted for cooldown.
         :return: cookie. Shouldn't be a cached one.
+
+        .. versionchanged:: 1.8.2
+
+            Raise :exc:`LoginCooldown` during cooldown, if :obj:`.cooldown_policy` is set.
+            Wait for admission of :obj:`.scheduler`. Cancellation is propagated instead of being
+            reported as a failure.
         """
         if self.lock.locked():
-            last_gtk = self.gtk
-            async with self.lock:
-                return last_gtk == self.gtk
+            last_generation = self.generation
+            self.waiting += 1
+            try:
+                async with self.lock:
+                    return last_generation != self.generation
+            finally:
+                self.waiting -= 1
         else:
+            if (retry_after := self.cooldown_until - time()) > 0:
+                raise LoginCooldown(retry_after, self._last_failure)
+
             # let the first request get result from Qzone.
             async with self.lock:
                 try:
-                    self.cookie = await self._new_cookie()
+                    if self.scheduler is None:
+                        self.cookie = await self._new_cookie()
+                    else:
+                        async with self.scheduler.admit(self):
+                            self.cookie = await self._new_cookie()
+                except asyncio.CancelledError:
+                    # the caller gives up the login, e.g. by a timeout. It is not a failure.
+                    raise
                 except BaseException as e:
+                    self._cool_down(e)
                     self.ch_login_notify.add_awaitable(self.login_failed.emit(self.uin, e))
                     return False
                 else:
+                    self._failures.clear()
+                    self.cooldown_until = 0
                     self.ch_login_notify.add_awaitable(self.login_success.emit(self.uin))
                     return True
                 finally:
                     self.last_login = time()
 
+    def _cool_down(self, exc: BaseException):
+        if (policy := self.cooldown_policy) is None:
+            return
+        cls = policy.failure_class(exc)
+        n = self._failures[cls] = self._failures.get(cls, 0) + 1
+        self._last_failure = cls
+        self.cooldown_until = time() + policy.cooldown(n)
+
+    @property
+    def cookie(self) -> Dict[str, str]:
+        """Cached cookie.
+
+        .. versionchanged:: 1.8.2
+
+            Assign a new dict to replace the cookie. In-place modifications are not
+            seen by :obj:`.signing`.
+        """
+        return self._cookie
+
+    @cookie.setter
+    def cookie(self, cookie: Dict[str, str]):
+        self._cookie = cookie
+        self._generation += 1
+        self._signing = None
+
+    @property
+    def generation(self) -> int:
+        """Login generation. It increases every time :obj:`.cookie` is replaced.
+
+        .. versionadded:: 1.8.2
+        """
+        return self._generation
+
+    @property
+    def signing(self) -> SigningContext:
+        """Signing context of current cookie. It is rebuilt only after the cookie is replaced.
+
+        .. versionadded:: 1.8.2
+        """
+        if self._signing is None:
+            self._signing = SigningContext.build(self._cookie, self._generation)
+        return self._signing
+
     @property
     def gtk(self) -> int:
         """Calculate g_token(gtk) using ``p_skey`` or ``skey`` field in the cookie.
@@ -72,7 +228,4 @@ class Loginable(ABC):
         .. note:: ``0`` denotes no existing login.
         .. seealso:: :meth:`qqqr.utils.encrypt.gtk`
         """
-        skey = self.cookie.get("p_skey") or self.cookie.get("skey")
-        if skey is None:
-            return 0
-        return gtk(skey)
+        return self.signing.gtk
@@ -0,0 +1,140 @@
+"""Try several login managers in turn, from the cheapest to the most expensive.
+
+A typical chain is: a stored cookie, validated by a probe; then password login within a time
+budget; then QR login as the last resort. The tier which worked last time is tried first next
+time.
+
+.. code-block:: python
+
+    chain = ChainLoginMan(
+        uin,
+        [
+            LoginTier(StoreLoginMan(uin, store), probe=cookie_probe(client, uin)),
+            LoginTier(UpLoginManager(client, up_config), budget=30),
+            LoginTier(QrLoginManager(client, qr_config)),
+        ],
+    )
+
+.. versionadded:: 1.8.2
+"""
+
+import asyncio
+import logging
+import typing as t
+from dataclasses import dataclass
+
+from tylisten import FutureStore
+
+from aioqzone.exception import LoginCooldown
+from qqqr.utils.net import ClientAdapter
+
+from ._base import Loginable
+
+log = logging.getLogger(__name__)
+
+__all__ = ["LoginTier", "ChainLoginMan", "cookie_probe"]
+
+Probe = t.Callable[[t.Dict[str, str]], t.Awaitable[bool]]
+
+
+def cookie_probe(client: ClientAdapter, uin: int) -> Probe:
+    """A probe which validates a cookie with :meth:`QzoneH5API.validate_cookie`. It never
+    triggers a login.
+    """
+    from aioqzone.api.h5 import QzoneH5API
+
+    from . import ConstLoginMan
+
+    async def probe(cookie: t.Dict[str, str]) -> bool:
+        api = QzoneH5API(client, ConstLoginMan(uin, cookie), retry_if_login_expire=False)
+        return await api.validate_cookie()
+
+    return probe
+
+
+@dataclass
+class LoginTier:
+    """A tier of :class:`ChainLoginMan`."""
+
+    login: Loginable
+    budget: t.Optional[float] = None
+    """Give up this tier after so many seconds. :obj:`None` means no limit."""
+    probe: t.Optional[Probe] = None
+    """Validate the cookie got by this tier. Useful for stored or external cookies."""
+
+    @property
+    def name(self) -> str:
+        return type(self.login).__name__
+
+
+class ChainLoginMan(Loginable):
+    """A login manager which tries its tiers in turn until one of them gives a valid cookie.
+
+    Each tier is logined by :meth:`Loginable.new_cookie`, so the cooldown of each tier is
+    respected: a cooling tier is skipped.
+    """
+
+    def __init__(
+        self,
+        uin: int,
+        tiers: t.Sequence[LoginTier],
+        *,
+        ch_login_notify: t.Optional[FutureStore] = None,
+    ) -> None:
+        """
+        :param tiers: tiers in the order to try, usually from the cheapest to the most expensive.
+        """
+        assert tiers
+        super().__init__(uin, ch_login_notify=ch_login_notify)
+        self.tiers = list(tiers)
+        self.last_tier: t.Optional[int] = None
+        """Index of the tier which worked last time. It is tried first next time."""
+
+    def _order(self) -> t.List[int]:
+        order = list(range(len(self.tiers)))
+        if self.last_tier is not None:
+            order.remove(self.last_tier)
+            order.insert(0, self.last_tier)
+        return order
+
+    async def _try_tier(self, tier: LoginTier) -> t.Optional[t.Dict[str, str]]:
+        try:
+            if tier.budget is None:
+                ok = await tier.login.new_cookie()
+            else:
+                ok = await asyncio.wait_for(tier.login.new_cookie(), tier.budget)
+        except asyncio.TimeoutError:
+            log.info(f"{tier.name} of {self.uin} exceeds its budget of {tier.budget}s")
+            return
+        except LoginCooldown as e:
+            log.info(f"{tier.name} of {self.uin} skipped: {e}")
+            return
+        if not ok:
+            return
+
+        cookie = tier.login.cookie
+        if tier.probe is None:
+            return cookie
+        try:
+            valid = await tier.probe(cookie)
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            log.warning(f"failed to probe cookie from {tier.name} of {self.uin}", exc_info=True)
+            return
+        if valid:
+            return cookie
+        log.info(f"cookie from {tier.name} of {self.uin} is invalid")
+
+    async def _new_cookie(self) -> t.Dict[str, str]:
+        """
+        :raise `RuntimeError`: if all tiers fail.
+        """
+        for i in self._order():
+            tier = self.tiers[i]
+            if (cookie := await self._try_tier(tier)) is not None:
+                log.info(f"{self.uin} logined by {tier.name}")
+                self.last_tier = i
+                return cookie
+        self.last_tier = None
+        raise RuntimeError(f"all login tiers of {self.uin} failed")
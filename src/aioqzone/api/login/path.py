@@ -0,0 +1,92 @@
+"""Choose between h5 and web login automatically.
+
+Captcha rates and latencies of the two login paths differ per account and change over time.
+A :class:`PathSelector` keeps statistics of recent logins on both paths, picks the path with
+the lower cost, and tries the other one now and then in case it becomes better.
+
+.. versionadded:: 1.8.2
+"""
+
+import asyncio
+import logging
+import typing as t
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from random import random
+from time import time
+
+from qqqr.exception import UnexpectedInteraction
+
+log = logging.getLogger(__name__)
+
+__all__ = ["PathStats", "PathSelector"]
+
+
+@dataclass
+class PathStats:
+    """Login statistics of one path. Old observations fade out, see :obj:`PathSelector.decay`."""
+
+    attempts: float = 0
+    success: float = 0
+    captcha: float = 0
+    """Logins which met a captcha."""
+    elapsed: float = 0
+    """Seconds spent in all attempts, successful or not."""
+
+    def cost(self, captcha_cost: float) -> float:
+        """Expected seconds spent per cookie. A captcha is counted as `captcha_cost` seconds."""
+        return (self.elapsed + self.captcha * captcha_cost) / max(self.success, 0.5)
+
+
+@dataclass
+class PathSelector:
+    """Select h5 or web login path for an account. Paths are represented by the `h5` flag."""
+
+    explore: float = 0.1
+    """Probability to try the path which is not the best."""
+    captcha_cost: float = 30
+    """A captcha is as bad as waiting so many seconds."""
+    decay: float = 0.9
+    """Statistics of a path are multiplied by this factor before a new observation is added."""
+    stats: t.Dict[bool, PathStats] = field(
+        default_factory=lambda: {True: PathStats(), False: PathStats()}
+    )
+
+    def best(self) -> bool:
+        return min(self.stats, key=lambda h5: self.stats[h5].cost(self.captcha_cost))
+
+    def choose(self) -> bool:
+        """Choose the path of next login. A path never tried is chosen first."""
+        for h5, s in self.stats.items():
+            if s.attempts == 0:
+                return h5
+        best = self.best()
+        if random() < self.explore:
+            log.debug(f"explore {'web' if best else 'h5'} login path")
+            return not best
+        return best
+
+    def record(self, h5: bool, *, success: bool, elapsed: float, captcha: bool = False) -> None:
+        s = self.stats[h5]
+        s.attempts = s.attempts * self.decay + 1
+        s.success = s.success * self.decay + success
+        s.captcha = s.captcha * self.decay + captcha
+        s.elapsed = s.elapsed * self.decay + elapsed
+
+    @contextmanager
+    def observe(self, h5: bool, captchas: t.Callable[[], int] = lambda: 0):
+        """Record the login in the context. Interruptions by user are not recorded.
+
+        :param h5: the path of this login.
+        :param captchas: returns how many captchas are met so far.
+        """
+        start, before = time(), captchas()
+        try:
+            yield
+        except (UnexpectedInteraction, asyncio.CancelledError, KeyboardInterrupt):
+            raise
+        except BaseException:
+            self.record(h5, success=False, elapsed=time() - start, captcha=captchas() > before)
+            raise
+        else:
+            self.record(h5, success=True, elapsed=time() - start, captcha=captchas() > before)
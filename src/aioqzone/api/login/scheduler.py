@@ -0,0 +1,122 @@
+"""Admit logins of all accounts in this process through one scheduler.
+
+When many cookies expire at once, every account logins at the same moment. Captcha rate rises
+and the CPU is saturated by pow and tdc. A :class:`LoginScheduler` caps concurrent logins,
+queues the rest and spreads them out with jitter. Queued accounts with more requests waiting
+for their login are admitted first.
+
+.. code-block:: python
+
+    Loginable.scheduler = LoginScheduler(max_concurrency=2, jitter=3)
+
+.. versionadded:: 1.8.2
+"""
+
+import asyncio
+import typing as t
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from itertools import count
+from random import random
+
+if t.TYPE_CHECKING:
+    from ._base import Loginable
+
+__all__ = ["LoginScheduler"]
+
+_admitted: ContextVar[t.Optional[int]] = ContextVar("login_admitted", default=None)
+"""Uin of the account whose login is admitted in this context, so that nested logins of the same
+account (e.g. tiers of a chain) are not queued again. Tasks spawned within the login inherit the
+context, but logins of other accounts in them are still queued."""
+
+
+@dataclass(eq=False)
+class _Waiter:
+    login: "Loginable"
+    seq: int
+    fut: "asyncio.Future[None]" = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+    def priority(self):
+        # more waiting requests first, then first come first served
+        return (self.login.waiting, -self.seq)
+
+
+class LoginScheduler:
+    """Cap and order concurrent logins across accounts."""
+
+    def __init__(self, max_concurrency: int = 2, *, jitter: float = 0.0) -> None:
+        """
+        :param max_concurrency: max logins running at the same time.
+        :param jitter: an admitted login sleeps a random time up to so many seconds before
+            starting, so that logins are spread out.
+        """
+        super().__init__()
+        assert max_concurrency > 0
+        self.max_concurrency = max_concurrency
+        self.jitter = jitter
+        self.running = 0
+        """Number of admitted logins."""
+        self._queue: t.List[_Waiter] = []
+        self._seq = count()
+
+    @property
+    def queued(self) -> int:
+        """Number of logins waiting for admission."""
+        return len(self._queue)
+
+    def _wake(self) -> None:
+        while self.running < self.max_concurrency and self._queue:
+            waiter = max(self._queue, key=_Waiter.priority)
+            self._queue.remove(waiter)
+            if waiter.fut.done():
+                continue
+            self.running += 1
+            waiter.fut.set_result(None)
+
+    async def acquire(self, login: "Loginable") -> None:
+        """Wait until `login` is admitted. Call :meth:`.release` after the login."""
+        if self.running < self.max_concurrency and not self._queue:
+            self.running += 1
+        else:
+            waiter = _Waiter(login, next(self._seq))
+            self._queue.append(waiter)
+            try:
+                await waiter.fut
+            except asyncio.CancelledError:
+                if waiter.fut.cancelled():
+                    if waiter in self._queue:
+                        self._queue.remove(waiter)
+                else:
+                    # admitted but cancelled at the same time
+                    self.release()
+                raise
+
+        if self.jitter > 0:
+            try:
+                await asyncio.sleep(random() * self.jitter)
+            except asyncio.CancelledError:
+                self.release()
+                raise
+
+    def release(self) -> None:
+        self.running -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def admit(self, login: "Loginable"):
+        """Run a login within this context. Nested admissions of the same account in the context
+        pass at once."""
+        if _admitted.get() == login.uin:
+            yield
+            return
+
+        await self.acquire(login)
+        token = _admitted.set(login.uin)
+        try:
+            yield
+        finally:
+            _admitted.reset(token)
+            self.release()
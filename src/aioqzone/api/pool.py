@@ -0,0 +1,232 @@
+"""Run many accounts over one shared connector.
+
+Every account owns its own :class:`~aiohttp.ClientSession`, so cookies and headers written by
+login flows never leak to other accounts. All these sessions share one connector, i.e. one
+connection pool and one DNS cache.
+
+.. versionadded:: 1.8.2
+"""
+
+import asyncio
+import logging
+import typing as t
+from dataclasses import dataclass
+from time import time
+
+from aiohttp import BaseConnector, CookieJar, TCPConnector
+
+from aioqzone.exception import NoAvailableAccount
+from qqqr.utils.net import ClientAdapter
+
+from .h5 import QzoneH5API
+from .login._base import Loginable
+
+log = logging.getLogger(__name__)
+
+T = t.TypeVar("T")
+
+__all__ = ["AccountHealth", "Account", "AccountPool"]
+
+
+@dataclass
+class AccountHealth:
+    """Health statistics of an account in :class:`AccountPool`."""
+
+    uin: int
+    inflight: int = 0
+    """Number of jobs running on this account."""
+    success: int = 0
+    failure: int = 0
+    consecutive_failure: int = 0
+    """Failures since last success. It is reset to 0 once a job or a login succeeds."""
+    login_success: int = 0
+    login_failure: int = 0
+    last_success: float = 0
+    """Timestamp of last successful job. 0 represents no success."""
+    last_failure: float = 0
+    """Timestamp of last failed job or login. 0 represents no failure."""
+    last_error: t.Optional[BaseException] = None
+
+
+@dataclass
+class Account:
+    client: ClientAdapter
+    """The client session of this account. It shares connector with other accounts."""
+    login: Loginable
+    api: QzoneH5API
+    health: AccountHealth
+
+    @property
+    def uin(self) -> int:
+        return self.login.uin
+
+    @property
+    def logined(self) -> bool:
+        return self.login.gtk != 0
+
+
+class AccountPool:
+    """A pool of accounts sharing one connector.
+
+    .. code-block:: python
+
+        async with AccountPool() as pool:
+            for conf in configs:
+                pool.add(lambda client: UpLoginManager(client, conf))
+            feeds = await pool.run(lambda api: api.get_active_feeds())
+    """
+
+    def __init__(
+        self,
+        connector: t.Optional[BaseConnector] = None,
+        *,
+        max_failures: int = 3,
+        probation: float = 60,
+        **session_kwds,
+    ) -> None:
+        """
+        :param connector: The shared connector. If not given, a :class:`~aiohttp.TCPConnector`
+            with DNS cache is created and owned by this pool.
+        :param max_failures: An account is considered unhealthy after so many consecutive failures.
+        :param probation: An unhealthy account is given one job to probe its health, so many
+            seconds after its last failure. The wait doubles with every further failure.
+        :param session_kwds: Other keywords passed to every :class:`~aiohttp.ClientSession`.
+        """
+        super().__init__()
+        self._own_connector = connector is None
+        self.connector = connector or TCPConnector(ttl_dns_cache=300)
+        self.max_failures = max_failures
+        self.probation = probation
+        self._session_kwds = session_kwds
+        self.accounts: t.Dict[int, Account] = {}
+        self._rr = 0
+
+    def new_client(self) -> ClientAdapter:
+        """Create a client session with its own cookie jar upon the shared connector."""
+        return ClientAdapter(
+            connector=self.connector,
+            connector_owner=False,
+            cookie_jar=CookieJar(),
+            **self._session_kwds,
+        )
+
+    def add(
+        self,
+        factory: t.Callable[[ClientAdapter], Loginable],
+        *,
+        api_cls: t.Type[QzoneH5API] = QzoneH5API,
+    ) -> Account:
+        """Add an account into the pool.
+
+        :param factory: Create the login manager with the given (isolated) client.
+        :param api_cls: API class of this account.
+        """
+        client = self.new_client()
+        try:
+            login = factory(client)
+            if login.uin in self.accounts:
+                raise ValueError(f"account {login.uin} exists")
+        except BaseException:
+            # the connector is shared, so the session is closed without closing the connector.
+            client.detach()
+            raise
+
+        health = AccountHealth(login.uin)
+        account = Account(client=client, login=login, api=api_cls(client, login), health=health)
+
+        def _on_login_success(uin: int):
+            health.login_success += 1
+            health.consecutive_failure = 0
+
+        def _on_login_failed(uin: int, exc: t.Union[BaseException, str]):
+            health.login_failure += 1
+            health.consecutive_failure += 1
+            health.last_failure = time()
+            if isinstance(exc, BaseException):
+                health.last_error = exc
+
+        login.login_success.add_impl(_on_login_success)
+        login.login_failed.add_impl(_on_login_failed)
+
+        self.accounts[login.uin] = account
+        return account
+
+    async def remove(self, uin: int) -> None:
+        """Remove an account from the pool and close its client."""
+        account = self.accounts.pop(uin)
+        await account.client.close()
+
+    def _on_probation(self, health: AccountHealth) -> bool:
+        """An unhealthy account is half-open once its probation is over: one job at a time is
+        let through, and a success makes it healthy again."""
+        extra = health.consecutive_failure - self.max_failures
+        wait = self.probation * 2 ** min(extra, 10)
+        return health.inflight == 0 and time() - health.last_failure >= wait
+
+    def healthy(self) -> t.List[Account]:
+        """Accounts whose consecutive failures are less than :obj:`.max_failures`, and unhealthy
+        accounts whose probation is over."""
+        return [
+            a
+            for a in self.accounts.values()
+            if a.health.consecutive_failure < self.max_failures or self._on_probation(a.health)
+        ]
+
+    def pick(self) -> Account:
+        """Pick a healthy account with the least running jobs. Ties are broken in round-robin.
+
+        :raise `NoAvailableAccount`: if no account is healthy.
+        """
+        candidates = self.healthy()
+        if not candidates:
+            raise NoAvailableAccount(len(self.accounts))
+
+        self._rr += 1
+        n = len(candidates)
+        rotated = candidates[self._rr % n :] + candidates[: self._rr % n]
+        return min(rotated, key=lambda a: a.health.inflight)
+
+    async def run(self, job: t.Callable[[QzoneH5API], t.Awaitable[T]]) -> T:
+        """Run a job on a picked account. The result is recorded into account health.
+
+        :param job: an async function which accepts the api of the picked account.
+        :raise `NoAvailableAccount`: if no account is healthy.
+        """
+        account = self.pick()
+        health = account.health
+        health.inflight += 1
+        try:
+            r = await job(account.api)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            health.failure += 1
+            health.consecutive_failure += 1
+            health.last_failure = time()
+            health.last_error = e
+            log.debug(f"job failed on account {account.uin}", exc_info=True)
+            raise
+        else:
+            health.success += 1
+            health.consecutive_failure = 0
+            health.last_success = time()
+            return r
+        finally:
+            health.inflight -= 1
+
+    def health(self) -> t.Dict[int, AccountHealth]:
+        """Report health of every account."""
+        return {uin: a.health for uin, a in self.accounts.items()}
+
+    async def close(self) -> None:
+        """Close all clients. The connector is closed only if it is created by this pool."""
+        for account in self.accounts.values():
+            await account.client.close()
+        if self._own_connector:
+            await self.connector.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
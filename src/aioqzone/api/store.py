@@ -0,0 +1,237 @@
+"""Persist cookies of login managers.
+
+Cookies are saved once :meth:`Loginable.new_cookie` succeeds. Saving is write-behind: it is queued
+and done in an executor, so it never blocks the event loop. Writes to the same uin are coalesced,
+only the latest cookie is written.
+
+.. versionadded:: 1.8.2
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import typing as t
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from time import time
+
+from .login._base import Loginable
+
+if t.TYPE_CHECKING:
+    from .h5 import QzoneH5API
+
+log = logging.getLogger(__name__)
+
+__all__ = [
+    "StoredCookie",
+    "CookieStore",
+    "JsonCookieStore",
+    "SqliteCookieStore",
+    "StoreLoginMan",
+]
+
+
+@dataclass(frozen=True)
+class StoredCookie:
+    cookie: t.Dict[str, str]
+    saved_at: float
+    """Timestamp when the cookie is saved."""
+
+
+class CookieStore(ABC):
+    """Base class of cookie stores. Subclasses implement the blocking :meth:`.load`,
+    :meth:`.save` and :meth:`.delete`; they are always called in an executor by the async
+    interfaces, and are called from one thread at a time.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._pending: t.Dict[int, StoredCookie] = {}
+        self._writer: t.Optional[asyncio.Future] = None
+        self._io_lock = threading.Lock()
+
+    @abstractmethod
+    def load(self, uin: int) -> t.Optional[StoredCookie]:
+        """Load the stored cookie of the given uin. :obj:`None` if not found."""
+        ...
+
+    @abstractmethod
+    def save(self, uin: int, cookie: StoredCookie) -> None:
+        """Save the cookie of the given uin, replacing the former one."""
+        ...
+
+    @abstractmethod
+    def delete(self, uin: int) -> None:
+        """Delete the stored cookie of the given uin. Nothing happens if not found."""
+        ...
+
+    def _locked(self, func: t.Callable[..., t.Any], *args):
+        with self._io_lock:
+            return func(*args)
+
+    async def aload(self, uin: int) -> t.Optional[StoredCookie]:
+        """Load a cookie in executor. Cookie waiting to be written is returned at once."""
+        if uin in self._pending:
+            return self._pending[uin]
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._locked, self.load, uin)
+
+    async def adelete(self, uin: int) -> None:
+        self._pending.pop(uin, None)
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._locked, self.delete, uin)
+
+    def save_behind(self, uin: int, cookie: t.Dict[str, str]) -> None:
+        """Queue a cookie to be saved. This returns immediately."""
+        self._pending[uin] = StoredCookie(dict(cookie), time())
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.ensure_future(self._write_pending())
+
+    async def _write_pending(self) -> None:
+        loop = asyncio.get_event_loop()
+        while self._pending:
+            uin, cookie = self._pending.popitem()
+            try:
+                await loop.run_in_executor(None, self._locked, self.save, uin, cookie)
+            except BaseException:
+                log.error(f"failed to save cookie of {uin}", exc_info=True)
+
+    async def flush(self) -> None:
+        """Wait until all queued cookies are written."""
+        while self._writer is not None and not self._writer.done():
+            await asyncio.shield(self._writer)
+
+    def attach(self, loginman: Loginable) -> None:
+        """Save cookie of the login manager every time it logins successfully."""
+        loginman.login_success.add_impl(lambda uin: self.save_behind(uin, loginman.cookie))
+
+    async def restore(self, api: "QzoneH5API") -> bool:
+        """Load stored cookie into :obj:`api.login <QzoneH5API.login>` and validate it with
+        :meth:`QzoneH5API.validate_cookie`. Invalid cookie is deleted from the store.
+        This should be called on startup, before any login is attempted.
+
+        :return: whether a valid cookie is restored.
+        """
+        login = api.login
+        stored = await self.aload(login.uin)
+        if stored is None:
+            return False
+
+        last_cookie = login.cookie
+        login.cookie = stored.cookie
+        try:
+            valid = await api.validate_cookie()
+        except BaseException:
+            login.cookie = last_cookie
+            raise
+        if valid:
+            login.last_login = stored.saved_at
+            log.info(f"restored cookie of {login.uin}")
+            return True
+
+        login.cookie = last_cookie
+        await self.adelete(login.uin)
+        return False
+
+
+class JsonCookieStore(CookieStore):
+    """Store cookies of all uins in one json file."""
+
+    def __init__(self, path: t.Union[str, Path]) -> None:
+        super().__init__()
+        self.path = Path(path)
+
+    def _read(self) -> t.Dict[str, t.Any]:
+        if not self.path.exists():
+            return {}
+        with open(self.path, encoding="utf8") as f:
+            return json.load(f)
+
+    def _write(self, d: t.Dict[str, t.Any]) -> None:
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf8") as f:
+            json.dump(d, f)
+        os.replace(tmp, self.path)
+
+    def load(self, uin: int) -> t.Optional[StoredCookie]:
+        if r := self._read().get(str(uin)):
+            return StoredCookie(r["cookie"], r["saved_at"])
+
+    def save(self, uin: int, cookie: StoredCookie) -> None:
+        d = self._read()
+        d[str(uin)] = dict(cookie=cookie.cookie, saved_at=cookie.saved_at)
+        self._write(d)
+
+    def delete(self, uin: int) -> None:
+        d = self._read()
+        if d.pop(str(uin), None) is not None:
+            self._write(d)
+
+
+class SqliteCookieStore(CookieStore):
+    """Store cookies in a sqlite database. The database can be shared among processes."""
+
+    def __init__(self, path: t.Union[str, Path], table: str = "cookie") -> None:
+        super().__init__()
+        self.path = str(path)
+        self.table = table
+        with self.connect() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(uin INTEGER PRIMARY KEY, cookie TEXT NOT NULL, saved_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def connect(self) -> t.Iterator[sqlite3.Connection]:
+        """Open a connection which commits on success and is always closed."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def load(self, uin: int) -> t.Optional[StoredCookie]:
+        with self.connect() as conn:
+            r = conn.execute(
+                f"SELECT cookie, saved_at FROM {self.table} WHERE uin = ?", (uin,)
+            ).fetchone()
+        if r:
+            return StoredCookie(json.loads(r[0]), r[1])
+
+    def save(self, uin: int, cookie: StoredCookie) -> None:
+        with self.connect() as conn:
+            conn.execute(
+                f"REPLACE INTO {self.table} (uin, cookie, saved_at) VALUES (?, ?, ?)",
+                (uin, json.dumps(cookie.cookie), cookie.saved_at),
+            )
+
+    def delete(self, uin: int) -> None:
+        with self.connect() as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE uin = ?", (uin,))
+
+
+class StoreLoginMan(Loginable):
+    """A login manager which "logins" with the cookie in a :class:`CookieStore`. It is usually
+    the first tier of :class:`~aioqzone.api.login.ChainLoginMan`, with a probe to validate
+    the cookie.
+
+    .. versionadded:: 1.8.2
+    """
+
+    def __init__(self, uin: int, store: CookieStore) -> None:
+        super().__init__(uin)
+        self.store = store
+
+    async def _new_cookie(self) -> t.Dict[str, str]:
+        """
+        :raise `LookupError`: if no cookie is stored.
+        """
+        if (stored := await self.store.aload(self.uin)) is None:
+            raise LookupError(f"no stored cookie of {self.uin}")
+        return stored.cookie
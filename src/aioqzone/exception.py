@@ -24,3 +24,30 @@ class CorruptError(ValueError):
     """Data corrupted in transfer."""
 
     pass
+
+
+class NoAvailableAccount(RuntimeError):
+    """No account in a pool is able to take the job.
+
+    .. versionadded:: 1.8.2
+    """
+
+    def __init__(self, total: int) -> None:
+        super().__init__(f"no healthy account in {total} accounts")
+        self.total = total
+
+
+class LoginCooldown(RuntimeError):
+    """Login is skipped since former logins failed recently.
+
+    .. versionadded:: 1.8.2
+    """
+
+    def __init__(self, retry_after: float, failure_class: str) -> None:
+        super().__init__(
+            f"login cooling down after {failure_class}, retry after {retry_after:.1f}s"
+        )
+        self.retry_after = retry_after
+        """Seconds to wait before next login is allowed."""
+        self.failure_class = failure_class
+        """Class of the last login failure."""
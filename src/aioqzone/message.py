@@ -10,8 +10,11 @@ __all__ = [
     "sms_code_input",
     "solve_select_captcha",
     "solve_slide_captcha",
+    "solve_select_captcha_image",
+    "solve_slide_captcha_image",
     "login_success",
     "login_failed",
+    "batch_qr_fetched",
 ]
 
 
@@ -32,3 +35,16 @@ def login_failed(uin: int, exc: t.Union[BaseException, str]) -> t.Any:
     :param exc: exception or error message
     """
     ...
+
+
+@hookdef
+def batch_qr_fetched(uin: int, png: t.Optional[bytes], times: int) -> t.Any:
+    """A QR is fetched for one of the accounts in a batch login.
+
+    :param uin: the account to scan the QR
+    :param png: QR bytes (png format). If None, the QR is pushed to user's mobile.
+    :param times: QR **expire** times of this account
+
+    .. versionadded:: 1.8.2
+    """
+    ...
@@ -1,4 +1,5 @@
 import typing as t
+from dataclasses import dataclass
 
 from pydantic import BaseModel, Field
 from yarl import URL
@@ -11,6 +12,23 @@ TyResponse = t.TypeVar("TyResponse", bound=QzoneResponse)
 TyHttpMethod = t.Union[t.Literal["GET"], t.Literal["POST"]]
 
 
+@dataclass(frozen=True)
+class RequestPlan:
+    """Request parts of a :class:`QzoneApi` subclass which never change among calls.
+
+    .. versionadded:: 1.8.2
+    """
+
+    url: URL
+    referer: str
+    """default referer"""
+    headers: t.Mapping[str, str]
+    """static headers, including the default referer"""
+
+
+_plan_cache: t.Dict[type, RequestPlan] = {}
+
+
 class QzoneApi(BaseModel, t.Generic[TyRequest, TyResponse]):
     host: t.ClassVar[str] = "https://h5.qzone.qq.com"
     http_method: t.ClassVar[TyHttpMethod]
@@ -24,9 +42,37 @@ class QzoneApi(BaseModel, t.Generic[TyRequest, TyResponse]):
     params: TyRequest = Field(default_factory=QzoneRequestParams)
     response: t.ClassVar[t.Type[TyResponse]]  # type: ignore
 
+    @classmethod
+    def plan(cls) -> RequestPlan:
+        """Get the request plan of this class. It is computed once per class.
+
+        .. versionadded:: 1.8.2
+        """
+        if (plan := _plan_cache.get(cls)) is None:
+            referer = cls.model_fields["referer"].default
+            headers = dict(Referer=referer)
+            if cls.keep_alive:
+                headers["Connection"] = "keep-alive"
+            if cls.accept:
+                headers["Accept"] = cls.accept
+            url = URL(str(cls.host)).with_path(cls.path)
+            plan = _plan_cache[cls] = RequestPlan(url=url, referer=referer, headers=headers)
+        return plan
+
     @property
     def url(self) -> URL:
-        return URL(str(self.host)).with_path(self.path)
+        return self.plan().url
+
+    def headers(self) -> t.Dict[str, str]:
+        """Get a new headers dict of this request.
+
+        .. versionadded:: 1.8.2
+        """
+        plan = self.plan()
+        headers = dict(plan.headers)
+        if self.referer != plan.referer:
+            headers["Referer"] = self.referer
+        return headers
 
 
 class IndexPageApi(QzoneApi[QzoneRequestParams, IndexPageResp]):
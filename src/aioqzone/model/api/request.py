@@ -34,7 +34,8 @@ class QzoneRequestParams(BaseModel):
     ts_fields: t.ClassVar[t.Tuple[str, ...]] = ()
 
     def build_params(self, uin: int, timestamp: t.Optional[float] = None):
-        d = self.model_dump(mode="json", by_alias=True)
+        # call the serializer directly to skip argument processing of `model_dump`
+        d = self.__pydantic_serializer__.to_python(self, mode="json", by_alias=True)
         d.update({i: uin for i in self.uin_fields})
         if self.ts_fields:
             timestamp = time_ms(timestamp)
@@ -20,9 +20,39 @@ class UpLoginConfig(LoginConfig):
     .. versionadded:: 1.8.2
     """
 
+    prefetch_captcha: bool = False
+    """Warm up the captcha connection concurrently with the login check. Enable this for accounts
+    which usually need a captcha.
+
+    .. versionadded:: 1.8.2
+    """
+
+    race_hooks: bool = False
+    """Take the first acceptable answer of captcha and sms hooks as soon as any impl gives it,
+    and cancel the other impls. Enable this if an automatic solver and a human fallback are both
+    registered.
+
+    .. versionadded:: 1.8.2
+    """
+
 
 class QrLoginConfig(LoginConfig):
     max_refresh_times: int = 6
     """Maximum QR code refresh times."""
     poll_freq: float = 3
-    """QR status polling interval."""
+    """QR status polling interval while idle."""
+    fast_poll_freq: float = 1
+    """QR status polling interval right after the QR is shown or scanned.
+
+    .. versionadded:: 1.8.2
+    """
+    fast_period: float = 10
+    """Poll fast in so many seconds after a QR is shown.
+
+    .. versionadded:: 1.8.2
+    """
+    qr_lifetime: float = 120
+    """Seconds before a QR expires. Expired QR is refreshed without polling.
+
+    .. versionadded:: 1.8.2
+    """
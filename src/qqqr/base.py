@@ -1,5 +1,6 @@
 import typing as t
 from abc import ABC, abstractmethod
+from http.cookies import SimpleCookie
 from time import time
 
 from yarl import URL
@@ -10,6 +11,9 @@ from .utils.net import ClientAdapter, get_all_cookie, raise_for_status, use_mobi
 
 XLOGIN_URL = "https://xui.ptlogin2.qq.com/cgi-bin/xlogin"
 
+_login_sig_cache: t.Dict[str, t.Tuple[float, URL, SimpleCookie]] = {}
+"""login page url -> (expire time, final url, cookies set by the login page)"""
+
 
 class LoginSession(ABC):
     """A LoginSession collects all data generated or received during login."""
@@ -32,6 +36,13 @@ _S = t.TypeVar("_S", bound=LoginSession)
 
 
 class LoginBase(ABC, t.Generic[_S]):
+    login_sig_ttl: float = 60
+    """Seconds to reuse a ``pt_login_sig`` for the same login page, i.e. the same app, proxy and
+    info, across login attempts and accounts. 0 disables the cache.
+
+    .. versionadded:: 1.8.2
+    """
+
     def __init__(
         self,
         client: ClientAdapter,
@@ -113,9 +124,42 @@ class LoginBase(ABC, t.Generic[_S]):
         raise NotImplementedError
 
     async def _pt_login_sig(self) -> str:
+        """Get ``pt_login_sig`` from the login page. The cookies set by the page are cached for
+        :obj:`.login_sig_ttl` seconds, and copied into the cookie jar of :obj:`.client` on hit.
+        The cache is keyed by :obj:`.login_page_url`.
+
+        .. versionchanged:: 1.8.2
+
+            Cache the login page cookies.
+        """
+        key = str(self.login_page_url)
+        if self.login_sig_ttl > 0 and (hit := _login_sig_cache.get(key)):
+            expire, url, cookies = hit
+            if expire > time():
+                self.client.cookie_jar.update_cookies(cookies, url)
+                return cookies["pt_login_sig"].value
+            del _login_sig_cache[key]
+
         async with self.client.get(self.login_page_url) as response:
             response.raise_for_status()
-            return response.cookies["pt_login_sig"].value
+            sig = response.cookies["pt_login_sig"].value
+            if self.login_sig_ttl > 0:
+                _login_sig_cache[key] = (
+                    time() + self.login_sig_ttl,
+                    response.url,
+                    response.cookies,
+                )
+        return sig
+
+    def _forget_login_sig(self, sig: str) -> None:
+        """Drop the cached ``pt_login_sig`` if it is `sig`, e.g. after a login with it failed,
+        so that later attempts fetch a new one.
+
+        .. versionadded:: 1.8.2
+        """
+        key = str(self.login_page_url)
+        if (hit := _login_sig_cache.get(key)) and hit[2]["pt_login_sig"].value == sig:
+            del _login_sig_cache[key]
 
     async def _get_login_url(
         self, sess: _S, cur_cookies: t.Optional[t.Mapping[str, t.Any]] = None
@@ -1,5 +1,6 @@
 import typing as t
 
+from PIL.Image import Image
 from tylisten import hookdef
 
 __all__ = [
@@ -8,6 +9,8 @@ __all__ = [
     "sms_code_input",
     "solve_select_captcha",
     "solve_slide_captcha",
+    "solve_select_captcha_image",
+    "solve_slide_captcha_image",
 ]
 
 
@@ -58,3 +61,25 @@ def solve_slide_captcha(background: bytes, piece: bytes, init_pos: t.Tuple[int,
     :return: the left position of the target area.
     """
     return 0
+
+
+@hookdef
+def solve_select_captcha_image(prompt: str, imgs: t.Tuple[Image, ...]) -> t.Sequence[int]:
+    """Same as :obj:`.solve_select_captcha`, but the choice images are decoded ones, so that
+    solvers need not decode png again. Impls of this hook are asked before those of
+    :obj:`.solve_select_captcha`. Do not modify the images.
+
+    .. versionadded:: 1.8.2
+    """
+    return ()
+
+
+@hookdef
+def solve_slide_captcha_image(background: Image, piece: Image, init_pos: t.Tuple[int, int]) -> int:
+    """Same as :obj:`.solve_slide_captcha`, but the images are decoded ones, so that
+    solvers need not decode png again. Impls of this hook are asked before those of
+    :obj:`.solve_slide_captcha`. Do not modify the images.
+
+    .. versionadded:: 1.8.2
+    """
+    return 0
@@ -2,9 +2,11 @@ import asyncio
 import logging
 import re
 import typing as t
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from random import random
+from time import time
 
+from tylisten import FutureStore
 from yarl import URL
 
 import qqqr.message as MT
@@ -32,11 +34,23 @@ class QR:
     """If None, the QR is pushed to user's client."""
     sig: str
     expired: bool = False
+    shown_at: float = field(default_factory=time, compare=False)
+    """Timestamp when the QR is fetched.
+
+    .. versionadded:: 1.8.2
+    """
 
     @property
     def pushed(self):
         return self.png is None
 
+    def age(self) -> float:
+        """Seconds since the QR is fetched.
+
+        .. versionadded:: 1.8.2
+        """
+        return time() - self.shown_at
+
 
 class QrSession(LoginSession):
     def __init__(
@@ -64,6 +78,24 @@ class _QrHookMixin:
         self.qr_cancelled = MT.qr_cancelled()
         self.cancel = asyncio.Event()
         self.refresh = asyncio.Event()
+        self.ch_qr_notify = FutureStore()
+        """Pending :obj:`.qr_fetched` deliveries. Hooks run concurrently with polling, so that a
+        slow hook never delays the login.
+
+        .. versionadded:: 1.8.2
+        """
+
+    def _notify_qr(self, png: t.Optional[bytes], times: int, renew: bool) -> None:
+        """Emit :obj:`.qr_fetched` in background. Errors of impls are logged by the hook itself,
+        and a timeout is logged here since no one awaits it."""
+
+        async def emit():
+            try:
+                await self.qr_fetched.emit(png=png, times=times, qr_renew=renew)
+            except asyncio.TimeoutError:
+                log.warning("qr_fetched hook timeout")
+
+        self.ch_qr_notify.add_awaitable(emit())
 
 
 class QrLogin(LoginBase[QrSession], _QrHookMixin):
@@ -122,6 +154,18 @@ class QrLogin(LoginBase[QrSession], _QrHookMixin):
             cookie.set(cookie.key, "", "")
         return await self.show(push_qr=False)
 
+    async def _wait_flags(self, timeout: float) -> None:
+        """Sleep `timeout` seconds, or until :obj:`.refresh` or :obj:`.cancel` is set."""
+        waiters = [
+            asyncio.ensure_future(self.refresh.wait()),
+            asyncio.ensure_future(self.cancel.wait()),
+        ]
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for w in waiters:
+                w.cancel()
+
     async def poll(self, sess: QrSession) -> PollResp:
         """Poll QR status.
 
@@ -166,19 +210,36 @@ class QrLogin(LoginBase[QrSession], _QrHookMixin):
         *,
         refresh_times: int = 6,
         poll_freq: float = 3,
+        fast_poll_freq: float = 1,
+        fast_period: float = 10,
+        qr_lifetime: float = 120,
     ):
         """Loop until cookie is returned or max `refresh_times` exceeds.
         - This method will emit :meth:`QrEvent.QrFetched` event if a new qrcode is fetched.
+          The hooks run in background, see :obj:`.ch_qr_notify`.
         - If qr is not scanned after `refresh_times`, it will raise :exc:`asyncio.TimeoutError`.
         - If :obj:`QrEvent.refresh_flag` is set, it will refresh qrcode at once without increasing expire counter.
-        - If :obj:`QrEvent.cancel_flag` is set, it will raise :exc:`UserBreak` before next polling.
+        - If :obj:`QrEvent.cancel_flag` is set, it will raise :exc:`UserBreak` at once.
+
+        Polling is fast in the first `fast_period` seconds of a QR, when the user is likely to
+        scan it, and after it is scanned, when the user is about to confirm. Otherwise it is slow.
+        A QR older than `qr_lifetime` is regarded as expired without polling, unless it is
+        scanned. A scanned QR is polled until the server reports it as expired.
 
         :meta public:
         :param refresh_times: max qr expire times.
-        :param poll_freq: interval between two status polling, in seconds, default as 3.
+        :param poll_freq: interval between two status polling while idle, in seconds, default as 3.
+        :param fast_poll_freq: interval between two fast polling, in seconds, default as 1.
+        :param fast_period: poll fast in so many seconds after a QR is shown.
+        :param qr_lifetime: seconds before a QR expires.
 
         :raise `UserTimeout`: if qr is not scanned after `refresh_times` expires.
         :raise `UserBreak`: if :obj:`QrEvent.cancel_flag` is set.
+
+        .. versionchanged:: 1.8.2
+
+            Polling is adaptive. Setting :obj:`.refresh` or :obj:`.cancel` takes effect at once.
+            :obj:`.qr_fetched` is no longer awaited before polling.
         """
         self.refresh.clear()
         self.cancel.clear()
@@ -188,19 +249,33 @@ class QrLogin(LoginBase[QrSession], _QrHookMixin):
         sess = await self.new()
 
         while cnt_expire < refresh_times:
-            # BUG: should we wrap hook errors here?
-            await self.qr_fetched.emit_suppress_timeout(
-                png=sess.current_qr.png, times=cnt_expire, qr_renew=renew
-            )
+            self._notify_qr(sess.current_qr.png, cnt_expire, renew)
             renew = False
+            scanned = False
 
             while not self.refresh.is_set():
                 if self.cancel.is_set():
                     await self.qr_cancelled.emit()
                     raise UserBreak
 
-                await asyncio.sleep(poll_freq)
+                qr = sess.current_qr
+                interval = fast_poll_freq if scanned or qr.age() < fast_period else poll_freq
+                # once scanned, the server decides when the QR expires.
+                if not scanned:
+                    if (remain := qr_lifetime - qr.age()) <= 0:
+                        log.debug("qr expired locally")
+                        cnt_expire += 1
+                        break
+                    interval = min(interval, remain)
+
+                await self._wait_flags(interval)
+                if self.refresh.is_set() or self.cancel.is_set():
+                    continue
+                if not scanned and qr.age() >= qr_lifetime:
+                    continue
+
                 stat = await self.poll(sess)
+                scanned = stat.code == StatusCode.Scanned
                 if stat.code == StatusCode.Expired:
                     cnt_expire += 1
                     break
@@ -2,24 +2,35 @@ import asyncio
 import base64
 import json
 import logging
+import os
 import re
+import threading
 import typing as t
+from concurrent.futures import Executor
+from functools import partial
 from random import random
 from time import time
-from urllib.parse import unquote
 
+from aiohttp import ClientError
 from pydantic import ValidationError
 from tenacity import after_log, retry, retry_if_exception_type, retry_if_result, stop_after_attempt
 
 import qqqr.message as MT
-from qqqr.message import solve_select_captcha, solve_slide_captcha
+from qqqr.message import (
+    solve_select_captcha,
+    solve_select_captcha_image,
+    solve_slide_captcha,
+    solve_slide_captcha_image,
+)
 
 from ...utils.net import ClientAdapter
 from .._model import VerifyResp
 from ._model import PrehandleResp
 from .capsess import BaseTcaptchaSession as TcaptchaSession
 from .select._types import SelectCaptchaSession
+from .tdc import TdcCache, default_tdc_cache
 
+CAPTCHA_HOST = "https://t.captcha.qq.com/"
 PREHANDLE_URL = "https://t.captcha.qq.com/cap_union_prehandle"
 SHOW_NEW_URL = "https://t.captcha.qq.com/cap_union_new_show"
 VERIFY_URL = "https://t.captcha.qq.com/cap_union_new_verify"
@@ -39,10 +50,19 @@ def hex_add(h: str, o: int):
 
 
 class _CaptchaHookMixin:
+    hook_timeout: float = 60
+    """Timeout of captcha hooks, in seconds.
+
+    .. versionadded:: 1.8.2
+    """
+
     def __init__(self, *args, **kwds) -> None:
         super().__init__(*args, **kwds)
-        self.solve_select_captcha = MT.solve_select_captcha.with_timeout(60)
-        self.solve_slide_captcha = MT.solve_slide_captcha.with_timeout(60)
+        timeout = self.hook_timeout
+        self.solve_select_captcha = MT.solve_select_captcha.with_timeout(timeout)
+        self.solve_slide_captcha = MT.solve_slide_captcha.with_timeout(timeout)
+        self.solve_select_captcha_image = MT.solve_select_captcha_image.with_timeout(timeout)
+        self.solve_slide_captcha_image = MT.solve_slide_captcha_image.with_timeout(timeout)
 
 
 class Captcha(_CaptchaHookMixin):
@@ -51,6 +71,8 @@ class Captcha(_CaptchaHookMixin):
     # new_show(html)--js in html->loadImg(url)
     solve_select_captcha: solve_select_captcha.TyInst
     solve_slide_captcha: solve_slide_captcha.TyInst
+    solve_select_captcha_image: solve_select_captcha_image.TyInst
+    solve_slide_captcha_image: solve_slide_captcha_image.TyInst
 
     def __init__(
         self,
@@ -58,11 +80,29 @@ class Captcha(_CaptchaHookMixin):
         appid: int,
         xlogin_url: str,
         fake_ip: t.Optional[str] = None,
+        *,
+        pow_executor: t.Optional[Executor] = None,
+        pow_workers: t.Optional[int] = None,
+        tdc_cache: t.Optional[TdcCache] = None,
+        tdc_executor: t.Optional[Executor] = None,
+        race_hooks: bool = False,
     ):
         """
         :param client: network client
         :param appid: Specify the appid of the application
         :param xlogin_url: :obj:`LoginBase.xlogin_url`
+        :param pow_executor: Solve the pow challenge in parallel in this executor, typically a
+            :class:`~concurrent.futures.ProcessPoolExecutor`. Default as solving in one thread.
+        :param pow_workers: Max concurrent chunks in `pow_executor`, default as cpu count.
+        :param tdc_cache: Cache of tdc scripts, default as the process-wide
+            :obj:`~.tdc.default_tdc_cache`.
+        :param tdc_executor: Run chaosvm in this executor, default as :func:`~.tdc.tdc_executor`.
+        :param race_hooks: sessions take the first acceptable hook answer and cancel the other
+            impls, see :obj:`~.capsess.BaseTcaptchaSession.race_hooks`.
+
+        .. versionchanged:: 1.8.2
+
+            Add `pow_executor`, `pow_workers`, `tdc_cache`, `tdc_executor` and `race_hooks`.
         """
 
         super().__init__()
@@ -71,6 +111,11 @@ class Captcha(_CaptchaHookMixin):
         self.xlogin_url = xlogin_url
         self.client.headers["Referer"] = "https://xui.ptlogin2.qq.com/"
         self.fake_ip = fake_ip
+        self.pow_executor = pow_executor
+        self.pow_workers = pow_workers or os.cpu_count() or 1
+        self.tdc_cache = tdc_cache or default_tdc_cache
+        self.tdc_executor = tdc_executor
+        self.race_hooks = race_hooks
 
     @property
     def base64_ua(self):
@@ -132,13 +177,29 @@ class Captcha(_CaptchaHookMixin):
         sess = TcaptchaSession.factory(sid, await retry_closure())
         if isinstance(sess, SelectCaptchaSession):
             sess.solve_captcha_hook = self.solve_select_captcha
+            sess.solve_image_hook = self.solve_select_captcha_image
         else:
             sess.solve_captcha_hook = self.solve_slide_captcha
+            sess.solve_image_hook = self.solve_slide_captcha_image
+        sess.race_hooks = self.race_hooks
+        sess.hook_timeout = self.hook_timeout
         return sess
 
     prehandle = new
     """alias of :meth:`.new`"""
 
+    async def warm_up(self) -> None:
+        """Open a connection to the captcha server ahead of :meth:`.new`, so that later captcha
+        requests skip dns lookup and tls handshake. Errors are logged and ignored.
+
+        .. versionadded:: 1.8.2
+        """
+        try:
+            async with self.client.head(CAPTCHA_HOST) as r:
+                log.debug(f"captcha connection warmed up: {r.status}")
+        except (ClientError, asyncio.TimeoutError) as e:
+            log.debug(f"failed to warm up captcha connection: {e!r}")
+
     @retry(
         stop=stop_after_attempt(2),
         retry=retry_if_result(lambda rst: not rst.ticket),
@@ -146,33 +207,60 @@ class Captcha(_CaptchaHookMixin):
     )
     async def verify(self, sid: str, *, loop: t.Optional[asyncio.AbstractEventLoop] = None):
         """
+        Captcha solving, tdc collecting and pow calculating run concurrently. Once any of them
+        fails, the others are cancelled at once, including the pow calculation in executor.
+
         :raise NotImplementedError: cannot solve captcha
+
+        .. versionchanged:: 1.8.2
+
+            Cancel sibling jobs once one of them fails.
         """
         sess = await self.new(sid)
         loop = loop or asyncio.get_event_loop()
+        cancel_pow = threading.Event()
 
         async def get_solve_captcha(client: ClientAdapter) -> str:
             await sess.get_captcha_problem(client)
-            return await sess.solve_captcha()
+            if ans := await sess.solve_captcha():
+                return ans
+            raise NotImplementedError("Failed to solve captcha")
 
         async def get_tdc_collect(client: ClientAdapter) -> str:
-            await sess.get_tdc(client, ip=self.fake_ip)
-            return unquote(str(sess.tdc.getData(None, True)))
+            await sess.get_tdc(
+                client, ip=self.fake_ip, cache=self.tdc_cache, executor=self.tdc_executor
+            )
+            return await sess.get_tdc_data(self.tdc_executor)
+
+        jobs = [
+            asyncio.ensure_future(get_solve_captcha(self.client)),
+            asyncio.ensure_future(get_tdc_collect(self.client)),
+            loop.run_in_executor(
+                None,
+                partial(
+                    sess.solve_workload,
+                    executor=self.pow_executor,
+                    workers=self.pow_workers,
+                    cancel=cancel_pow,
+                ),
+            ),
+        ]
+        try:
+            ans, collect, _ = await asyncio.gather(*jobs)
+        except BaseException:
+            # the pow thread cannot be cancelled by asyncio, stop it cooperatively.
+            cancel_pow.set()
+            for job in jobs:
+                job.cancel()
+            await asyncio.gather(*jobs, return_exceptions=True)
+            raise
 
-        ans, collect, _ = await asyncio.gather(
-            get_solve_captcha(self.client),
-            get_tdc_collect(self.client),
-            loop.run_in_executor(None, sess.solve_workload),
-        )
-        if not ans:
-            raise NotImplementedError("Failed to solve captcha")
         ans = dict(
             elem_id=1,
             type=sess.data_type,
             data=ans,
         )
-        info = sess.tdc.getInfo(None)["info"]
-        assert isinstance(info, str)
+        info = await sess.get_tdc_info(self.tdc_executor)
 
         data = {
             "collect": collect,
@@ -1,8 +1,11 @@
 import asyncio
+import threading
 import typing as t
 from abc import ABC, abstractmethod
-from hashlib import md5
+from concurrent.futures import Executor
+from functools import partial
 from time import time
+from urllib.parse import unquote
 
 from tylisten import HookSpec
 from yarl import URL
@@ -10,12 +13,25 @@ from yarl import URL
 from qqqr.utils.net import ClientAdapter
 
 from ._model import PrehandleResp
+from .tdc import TdcCache, default_tdc_cache, tdc_executor
+from .workload import solve_pow
 
 
 class BaseTcaptchaSession(ABC):
     data_type: str = "DynAnswerType_UC"
     mouse_track: "asyncio.Future[t.Optional[t.List[t.Tuple[int, int]]]]"
     solve_captcha_hook: HookSpec
+    race_hooks: bool = False
+    """Take the first acceptable answer as soon as any hook impl gives it, and cancel the rest,
+    instead of waiting for all impls. See :func:`qqqr.utils.hook.race`.
+
+    .. versionadded:: 1.8.2
+    """
+    hook_timeout: t.Optional[float] = None
+    """Seconds to wait for :obj:`.solve_captcha_hook` and other hooks, default as no limit.
+
+    .. versionadded:: 1.8.2
+    """
 
     def __init__(
         self,
@@ -34,29 +50,41 @@ class BaseTcaptchaSession(ABC):
     def parse_captcha_data(self):
         self.conf = self.prehandle.captcha
 
-    def solve_workload(self, *, timeout: float = 30.0):
+    def solve_workload(
+        self,
+        *,
+        timeout: float = 30.0,
+        executor: t.Optional[Executor] = None,
+        workers: int = 1,
+        cancel: t.Optional[threading.Event] = None,
+    ):
         """
         The solve_workload function solves the workload from Tcaptcha:
         It solves md5(:obj:`PowCfg.prefix` + str(?)) == :obj:`PowCfg.md5`.
         The result and the calculating duration will be saved into this session.
 
         :param timeout: Calculating timeout, default as 30 seconds.
+        :param executor: Search concurrently in this executor, see :func:`.workload.solve_pow`.
+        :param workers: Max concurrent searching chunks in `executor`.
+        :param cancel: Stop calculating once this event is set.
         :return: None
+
+        .. versionchanged:: 1.8.2
+
+            Add `executor` and `workers` to solve in parallel, and `cancel` to stop early.
         """
 
         pow_cfg = self.conf.common.pow_cfg
-        nonce = str(pow_cfg.prefix).encode()
-        target = pow_cfg.md5.lower()
 
         start = time()
-        cnt = 0
-
-        while time() - start < timeout:
-            if md5(nonce + str(cnt).encode()).hexdigest() == target:
-                break
-            cnt += 1
-
-        self.pow_ans = cnt
+        self.pow_ans, _ = solve_pow(
+            pow_cfg.prefix,
+            pow_cfg.md5,
+            timeout=timeout,
+            executor=executor,
+            workers=workers,
+            cancel=cancel,
+        )
         # on some environment this time is too low... add a limit
         self.duration = max(int((time() - start) * 1e3), 50)
 
@@ -71,21 +99,62 @@ class BaseTcaptchaSession(ABC):
         raise NotImplementedError
 
     async def get_tdc(
-        self, client: ClientAdapter, ua: t.Optional[str] = None, ip: t.Optional[str] = None
+        self,
+        client: ClientAdapter,
+        ua: t.Optional[str] = None,
+        ip: t.Optional[str] = None,
+        *,
+        cache: t.Optional[TdcCache] = None,
+        executor: t.Optional[Executor] = None,
     ):
         """
         .. note:: If :obj:`.mouse_track` should be set, set it before calling this method.
+
+        :param cache: Get the tdc script from this cache, default as :obj:`.default_tdc_cache`.
+        :param executor: Prepare the vm in this executor, default as :func:`.tdc_executor`.
+
+        .. versionchanged:: 1.8.2
+
+            The tdc script is cached. The vm is prepared in an executor.
         """
         from chaosvm import prepare
 
-        async with client.get(self._tdx_js_url()) as r:
-            r.raise_for_status()
-            self.tdc = prepare(
-                await r.text("utf8"),
+        script = await (cache or default_tdc_cache).fetch(client, self._tdx_js_url())
+        loop = asyncio.get_event_loop()
+        self.tdc = await loop.run_in_executor(
+            executor or tdc_executor(),
+            partial(
+                prepare,
+                script,
                 ip=ip or self.prehandle.uip,
                 ua=ua or client.headers["User-Agent"],
                 mouse_track=await self.mouse_track,
-            )
+            ),
+        )
+
+    async def get_tdc_data(self, executor: t.Optional[Executor] = None) -> str:
+        """Run ``tdc.getData`` in an executor. Call :meth:`.get_tdc` first.
+
+        :param executor: default as :func:`.tdc_executor`.
+
+        .. versionadded:: 1.8.2
+        """
+        loop = asyncio.get_event_loop()
+        data = await loop.run_in_executor(executor or tdc_executor(), self.tdc.getData, None, True)
+        return unquote(str(data))
+
+    async def get_tdc_info(self, executor: t.Optional[Executor] = None) -> str:
+        """Run ``tdc.getInfo`` in an executor. Call :meth:`.get_tdc` first.
+
+        :param executor: default as :func:`.tdc_executor`.
+
+        .. versionadded:: 1.8.2
+        """
+        loop = asyncio.get_event_loop()
+        r = await loop.run_in_executor(executor or tdc_executor(), self.tdc.getInfo, None)
+        info = r["info"]
+        assert isinstance(info, str)
+        return info
 
     @abstractmethod
     async def get_captcha_problem(self, client: ClientAdapter): ...
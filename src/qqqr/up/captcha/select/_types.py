@@ -1,12 +1,12 @@
 import asyncio
 import logging
 import typing as t
-from contextlib import suppress
 
+from PIL import Image as image
 from pydantic import AliasPath, BaseModel, Field, model_validator
 
-from qqqr.message import solve_select_captcha
-from qqqr.utils.iter import first
+from qqqr.message import solve_select_captcha, solve_select_captcha_image
+from qqqr.utils.hook import answer
 from qqqr.utils.jsjson import json_loads
 from qqqr.utils.net import ClientAdapter
 
@@ -55,10 +55,18 @@ class SelectCaptchaDisplay(BaseModel):
 
 class SelectCaptchaSession(BaseTcaptchaSession):
     solve_captcha_hook: solve_select_captcha.TyInst
+    solve_image_hook: solve_select_captcha_image.TyInst
+    """Hook which receives decoded images.
+
+    .. versionadded:: 1.8.2
+    """
 
     def __init__(self, session: str, prehandle: PrehandleResp) -> None:
         super().__init__(session, prehandle)
         self.mouse_track.set_result(None)
+        self.cdn_images: t.List[image.Image] = []
+        """Decoded choices."""
+        self._cdn_imgs: t.Optional[t.List[bytes]] = None
 
     def parse_captcha_data(self):
         super().parse_captcha_data()
@@ -67,23 +75,72 @@ class SelectCaptchaSession(BaseTcaptchaSession):
             self.data_type = self.render.bg.click_cfg.data_type[0]
 
     async def get_captcha_problem(self, client: ClientAdapter):
+        """Download the background, then decode it and crop the choices in an executor.
+
+        .. versionchanged:: 1.8.2
+
+            Choices are kept as decoded images in :obj:`.cdn_images`. They are encoded into
+            :obj:`.cdn_imgs` on first access, or when :obj:`.solve_captcha_hook` is asked.
+        """
         async with client.get(self._cdn_join(self.render.bg.img_url)) as r:
-            img = frombytes(await r.content.read())
+            content = await r.content.read()
+
+        loop = asyncio.get_event_loop()
+        self.cdn_images = await loop.run_in_executor(None, self._crop, content)
+        self._cdn_imgs = None
+
+    @property
+    def cdn_imgs(self) -> t.List[bytes]:
+        """Choices encoded as png. They are encoded from :obj:`.cdn_images` on first access,
+        which is blocking.
 
-        imgs = {
-            r.id: tobytes(img.crop(r.box)) for r in self.render.json_payload.select_region_list
-        }
-        self.cdn_imgs = [imgs[i] for i in self.render.json_payload.picture_ids]
+        .. versionchanged:: 1.8.2
+
+            Encoded lazily.
+        """
+        if self._cdn_imgs is None:
+            self._cdn_imgs = [tobytes(i) for i in self.cdn_images]
+        return self._cdn_imgs
+
+    @cdn_imgs.setter
+    def cdn_imgs(self, imgs: t.List[bytes]):
+        self._cdn_imgs = imgs
+
+    def _crop(self, content: bytes) -> t.List[image.Image]:
+        """Decode the background and crop the choices. This is blocking."""
+        img = frombytes(content)
+        imgs = {r.id: img.crop(r.box) for r in self.render.json_payload.select_region_list}
+        return [imgs[i] for i in self.render.json_payload.picture_ids]
 
     async def solve_captcha(self) -> str:
-        if not self.solve_captcha_hook.has_impl:
+        """Impls of :obj:`.solve_image_hook` are asked first with decoded images. If none of them
+        answers, impls of :obj:`.solve_captcha_hook` are asked with png bytes. If
+        :obj:`.race_hooks` is set, the first impl finishing with an acceptable answer wins.
+        """
+        if not self.solve_captcha_hook.has_impl and not self.solve_image_hook.has_impl:
             log.warning("solve_captcha_hook has no impls.")
             return ""
 
-        ans = ()
-        with suppress(asyncio.TimeoutError):
-            hook_results = await self.solve_captcha_hook.results(
-                self.render.instruction, tuple(self.cdn_imgs)
+        ans = None
+        if self.solve_image_hook.has_impl:
+            ans = await answer(
+                self.solve_image_hook,
+                bool,
+                self.render.instruction,
+                tuple(self.cdn_images),
+                racing=self.race_hooks,
+                timeout=self.hook_timeout,
+            )
+        if not ans and self.solve_captcha_hook.has_impl:
+            # encode in an executor rather than on first access in the event loop.
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, lambda: self.cdn_imgs)
+            ans = await answer(
+                self.solve_captcha_hook,
+                bool,
+                self.render.instruction,
+                tuple(self.cdn_imgs),
+                racing=self.race_hooks,
+                timeout=self.hook_timeout,
             )
-            ans = first(hook_results, lambda i: bool(i), default=())
-        return ",".join(str(self.render.json_payload.picture_ids[i - 1]) for i in ans)
+        return ",".join(str(self.render.json_payload.picture_ids[i - 1]) for i in ans or ())
@@ -1,18 +1,20 @@
 import asyncio
 import logging
 import typing as t
-from contextlib import suppress
 from random import choices, randint
 
+from PIL import Image as image
 from pydantic import BaseModel, Field
 
-from qqqr.message import solve_slide_captcha
-from qqqr.utils.iter import first, firstn
+from qqqr.message import solve_slide_captcha, solve_slide_captcha_image
+from qqqr.utils.hook import answer
+from qqqr.utils.iter import first
 from qqqr.utils.net import ClientAdapter
 
 from .._model import FgBindingCfg, FgElemCfg, Sprite
 from ..capsess import BaseTcaptchaSession
 from ..pil_utils import *
+from . import solver
 
 log = logging.getLogger(__name__)
 
@@ -77,6 +79,11 @@ class SlideCaptchaDisplay(BaseModel):
 
 class SlideCaptchaSession(BaseTcaptchaSession):
     solve_captcha_hook: solve_slide_captcha.TyInst
+    solve_image_hook: solve_slide_captcha_image.TyInst
+    """Hook which receives decoded images.
+
+    .. versionadded:: 1.8.2
+    """
 
     def parse_captcha_data(self):
         super().parse_captcha_data()
@@ -109,6 +116,12 @@ class SlideCaptchaSession(BaseTcaptchaSession):
 
         self.cdn_imgs = list(await asyncio.gather(*(r(i) for i in self.cdn_urls)))
 
+    def _decode(self) -> t.Tuple[image.Image, image.Image]:
+        """Decode the background and crop the piece. This is blocking."""
+        background, sprite = map(frombytes, self.cdn_imgs)
+        background.load()
+        return background, sprite.crop(self.piece_sprite.box)
+
     async def solve_captcha(self):
         """
         The solve_captcha function solves the captcha problem. It assumes that :obj:`TcaptchaSession.cdn_imgs`
@@ -118,27 +131,63 @@ class SlideCaptchaSession(BaseTcaptchaSession):
 
         This function will also call :meth:`TDC.set_data` to imitate human behavior when solving captcha.
 
+        Impls of :obj:`.solve_image_hook` are asked first with decoded images. If none of them
+        answers, impls of :obj:`.solve_captcha_hook` are asked with png bytes. If no impl gives
+        an answer, the built-in :func:`.solver.locate_gap` is used if NumPy is installed.
+        Decoding, encoding and the built-in solver run in an executor. If :obj:`.race_hooks` is
+        set, the first impl finishing with an acceptable answer wins.
+
+        .. versionchanged:: 1.8.2
+
+            Add :obj:`.solve_image_hook`, fallback to the built-in solver and racing mode.
+
         :param self: Store the information of the current selfion
         :return: None
         """
         assert self.cdn_imgs
 
-        if not self.solve_captcha_hook.has_impl:
-            log.warning("solve_captcha_hook has no impls.")
+        has_hook = self.solve_image_hook.has_impl or self.solve_captcha_hook.has_impl
+        if not has_hook and not solver.available:
+            log.warning("solve_captcha_hook has no impls, and numpy is not installed.")
             return ""
 
+        loop = asyncio.get_event_loop()
         background, piece = self.cdn_imgs
-        piece_img = frombytes(piece).crop(self.piece_sprite.box)
-        piece = tobytes(piece_img)
-
+        background_img, piece_img = await loop.run_in_executor(None, self._decode)
         left, top = self.piece_sprite.init_pos
 
+        # BUG: +1 to ensure left > init_pos[0], otherwise it's >=.
+        # However if left == init_pos[0] + 1, it is certainly a wrong result.
+        right_of_init = lambda i: i > left
+
         ans = None
-        with suppress(asyncio.TimeoutError):
-            hook_results = await self.solve_captcha_hook.results(background, piece, (left, top))
-            # BUG: +1 to ensure left > init_pos[0], otherwise it's >=.
-            # However if left == init_pos[0] + 1, it is certainly a wrong result.
-            ans = firstn(hook_results, lambda i: i > left)
+        if self.solve_image_hook.has_impl:
+            ans = await answer(
+                self.solve_image_hook,
+                right_of_init,
+                background_img,
+                piece_img,
+                (left, top),
+                racing=self.race_hooks,
+                timeout=self.hook_timeout,
+            )
+        if ans is None and self.solve_captcha_hook.has_impl:
+            piece = await loop.run_in_executor(None, tobytes, piece_img)
+            ans = await answer(
+                self.solve_captcha_hook,
+                right_of_init,
+                background,
+                piece,
+                (left, top),
+                racing=self.race_hooks,
+                timeout=self.hook_timeout,
+            )
+        if ans is None and solver.available:
+            if has_hook:
+                log.info("no hook answers the slide captcha, fallback to the built-in solver")
+            ans = await loop.run_in_executor(
+                None, solver.locate_gap, background_img, piece_img, (left, top)
+            )
 
         if ans is None:
             return ""
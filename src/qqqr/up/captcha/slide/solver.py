@@ -0,0 +1,102 @@
+"""A built-in slide captcha solver which requires only Pillow and NumPy.
+
+The background has a dimmed gap in the shape of the piece. The piece outline is slid along the
+row of the piece, and the position where the band just inside the outline is darkest compared to
+the band just outside is taken as the gap. The thin highlight drawn on the gap border is skipped
+by leaving a margin between the two bands.
+
+.. versionadded:: 1.8.2
+"""
+
+import typing as t
+
+from PIL import Image as image
+
+from ..pil_utils import frombytes
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+__all__ = ["available", "locate_gap", "solve_slide"]
+
+available = np is not None
+"""Whether the solver can be used, i.e. NumPy is installed."""
+
+
+def _erode(mask: "np.ndarray", n: int) -> "np.ndarray":
+    """Erode `mask` with a cross, `n` times. Pixels out of the image are not in the mask."""
+    for _ in range(n):
+        p = np.pad(mask, 1)
+        mask = p[1:-1, 1:-1] & p[:-2, 1:-1] & p[2:, 1:-1] & p[1:-1, :-2] & p[1:-1, 2:]
+    return mask
+
+
+def _dilate(mask: "np.ndarray", n: int) -> "np.ndarray":
+    """Dilate `mask` with a cross, `n` times."""
+    for _ in range(n):
+        p = np.pad(mask, 1)
+        mask = p[1:-1, 1:-1] | p[:-2, 1:-1] | p[2:, 1:-1] | p[1:-1, :-2] | p[1:-1, 2:]
+    return mask
+
+
+def _piece_mask(piece: image.Image) -> "np.ndarray":
+    """The shape of the piece. Transparent pixels are out of the shape."""
+    if "A" in piece.getbands():
+        alpha = np.asarray(piece.getchannel("A"))
+        if alpha.min() < 128:
+            return alpha >= 128
+    return np.ones((piece.height, piece.width), dtype=bool)
+
+
+def locate_gap(
+    background: image.Image,
+    piece: image.Image,
+    init_pos: t.Tuple[int, int],
+    *,
+    inner: t.Tuple[int, int] = (2, 6),
+    outer: t.Tuple[int, int] = (1, 4),
+) -> int:
+    """Locate the gap in the background.
+
+    :param background: the background with a dimmed gap.
+    :param piece: the piece, whose alpha channel defines its shape.
+    :param init_pos: the initial (left, top) position of the piece on the background.
+    :param inner: the band inside the outline, as (from, to) pixels away from the outline.
+    :param outer: the band outside the outline, as (from, to) pixels away from the outline.
+    :return: the left position of the gap. It is always greater than the initial left.
+    """
+    assert np is not None, "numpy is required"
+    left, top = init_pos
+    bg = np.asarray(background.convert("L"), dtype=np.float32)
+    mask = _piece_mask(piece)
+    h, w = mask.shape
+    H, W = bg.shape
+
+    inner_band = _erode(mask, inner[0]) & ~_erode(mask, inner[1])
+    iy, ix = np.nonzero(inner_band)
+    # the outer band exceeds the piece box, so pad the mask first.
+    pad = outer[1]
+    padded = np.pad(mask, pad)
+    outer_band = _dilate(padded, outer[1]) & ~_dilate(padded, outer[0])
+    oy, ox = np.nonzero(outer_band)
+    oy -= pad
+    ox -= pad
+
+    top = min(max(top, pad), H - h - pad)
+    cands = np.arange(max(left + 1, pad), W - w - pad + 1)
+    if cands.size == 0:
+        return left + 1
+
+    # (band pixels, candidates) matrices by fancy indexing, all candidates at once.
+    inside = bg[top + iy[:, None], ix[:, None] + cands].mean(axis=0)
+    outside = bg[top + oy[:, None], ox[:, None] + cands].mean(axis=0)
+    return int(cands[np.argmax(outside - inside)])
+
+
+def solve_slide(background: bytes, piece: bytes, init_pos: t.Tuple[int, int]) -> int:
+    """A :obj:`~qqqr.message.solve_slide_captcha` implementation with :func:`locate_gap`.
+    This is blocking, run it in an executor.
+    """
+    return locate_gap(frombytes(background), frombytes(piece), init_pos)
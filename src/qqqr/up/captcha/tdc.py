@@ -0,0 +1,144 @@
+"""Cache and executor of the tdc script which is run by chaosvm to collect environment data.
+
+The script at :obj:`CommonCaptchaConf.tdc_path` rarely changes, so it is downloaded once and
+reused by later captcha sessions. Concurrent sessions missing the same script share one
+download. Scripts are kept in memory by the digest of their content, so urls serving the same
+script share one copy. They can also be saved in a directory to survive restarts.
+
+Running the script in chaosvm is CPU-heavy, so it is run in :func:`tdc_executor` rather than
+in the event loop.
+
+.. versionadded:: 1.8.2
+"""
+
+import asyncio
+import hashlib
+import os
+import typing as t
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from yarl import URL
+
+from qqqr.utils.net import ClientAdapter
+
+__all__ = ["TdcCache", "default_tdc_cache", "tdc_executor"]
+
+_executor: t.Optional[ThreadPoolExecutor] = None
+
+
+def _digest(s: str) -> str:
+    return hashlib.sha256(s.encode()).hexdigest()
+
+
+class TdcCache:
+    """A LRU cache of tdc scripts keyed by tdc url."""
+
+    def __init__(self, directory: t.Union[str, Path, None] = None, maxsize: int = 16) -> None:
+        """
+        :param directory: Save scripts in this directory as well. Default as memory only.
+        :param maxsize: Max tdc urls kept in memory.
+        """
+        super().__init__()
+        self.directory = None if directory is None else Path(directory)
+        self.maxsize = maxsize
+        self._paths: "OrderedDict[str, str]" = OrderedDict()
+        """tdc url -> content digest"""
+        self._scripts: t.Dict[str, str] = {}
+        """content digest -> script"""
+        self._inflight: t.Dict[str, "asyncio.Future[str]"] = {}
+        """tdc url -> running download"""
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def _file(self, tdc_url: str) -> Path:
+        assert self.directory
+        return self.directory / f"{_digest(tdc_url)}.js"
+
+    def get(self, tdc_url: str) -> t.Optional[str]:
+        """Get a script from memory."""
+        if (digest := self._paths.get(tdc_url)) is None:
+            return
+        self._paths.move_to_end(tdc_url)
+        return self._scripts[digest]
+
+    def put(self, tdc_url: str, script: str) -> None:
+        """Put a script into memory."""
+        digest = _digest(script)
+        self._paths[tdc_url] = digest
+        self._paths.move_to_end(tdc_url)
+        self._scripts[digest] = script
+        while len(self._paths) > self.maxsize:
+            _, digest = self._paths.popitem(last=False)
+            if digest not in self._paths.values():
+                del self._scripts[digest]
+
+    def load(self, tdc_url: str) -> t.Optional[str]:
+        """Load a script from :obj:`.directory`. This is blocking."""
+        if self.directory is None:
+            return
+        file = self._file(tdc_url)
+        if file.exists():
+            return file.read_text(encoding="utf8")
+
+    def save(self, tdc_url: str, script: str) -> None:
+        """Save a script into :obj:`.directory`. This is blocking."""
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        file = self._file(tdc_url)
+        tmp = file.with_name(file.name + ".tmp")
+        tmp.write_text(script, encoding="utf8")
+        os.replace(tmp, file)
+
+    async def fetch(self, client: ClientAdapter, tdc_url: t.Union[str, URL]) -> str:
+        """Get the script of `tdc_url` from memory, then from disk, then from network.
+        Concurrent misses of the same url wait for one download.
+
+        :param client: client to download the script.
+        :param tdc_url: url of the script, see :meth:`BaseTcaptchaSession._tdx_js_url`.
+        """
+        key = str(tdc_url)
+        if (script := self.get(key)) is not None:
+            return script
+
+        if (fut := self._inflight.get(key)) is None:
+            fut = self._inflight[key] = asyncio.ensure_future(self._fetch(client, tdc_url))
+            fut.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # a cancelled caller should not cancel the download shared with others
+        return await asyncio.shield(fut)
+
+    async def _fetch(self, client: ClientAdapter, tdc_url: t.Union[str, URL]) -> str:
+        key = str(tdc_url)
+        loop = asyncio.get_event_loop()
+        if self.directory is not None:
+            if (script := await loop.run_in_executor(None, self.load, key)) is not None:
+                self.put(key, script)
+                return script
+
+        async with client.get(tdc_url) as r:
+            r.raise_for_status()
+            script = await r.text("utf8")
+
+        self.put(key, script)
+        if self.directory is not None:
+            await loop.run_in_executor(None, self.save, key, script)
+        return script
+
+
+default_tdc_cache = TdcCache()
+"""The cache shared by captcha sessions unless another cache is given."""
+
+
+def tdc_executor() -> ThreadPoolExecutor:
+    """The executor dedicated to chaosvm. It is created on first use.
+
+    A prepared vm is used by the session which prepared it, so it must stay in this process;
+    a thread pool is used instead of a process pool.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chaosvm")
+    return _executor
@@ -0,0 +1,113 @@
+"""Solve the proof-of-work challenge of Tcaptcha, i.e. find the least ``n`` such that
+``md5(prefix + str(n)) == target``.
+
+The search space is split into chunks. Chunks are searched one by one in current thread,
+or concurrently in an executor, e.g. a :class:`~concurrent.futures.ProcessPoolExecutor`.
+Once an answer is found, chunks not started yet are cancelled. The search can also be cancelled
+cooperatively by setting a :class:`threading.Event`, which is checked between chunks.
+
+.. versionadded:: 1.8.2
+"""
+
+import threading
+import typing as t
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from hashlib import md5
+from time import time
+
+__all__ = ["search_range", "solve_pow"]
+
+CHUNK = 1 << 15
+"""Counters searched in one chunk. A chunk takes about 10ms on a modern core."""
+
+
+def search_range(prefix: bytes, target: bytes, start: int, stop: int) -> int:
+    """Search the answer in ``range(start, stop)``. This is a top-level function so that it can be
+    sent to a process pool.
+
+    :param prefix: the pow prefix.
+    :param target: the md5 digest (not the hex one) to match.
+    :return: the answer, or -1 if not in the range.
+    """
+    # md5 of the prefix is copied instead of hashing the prefix again.
+    h = md5(prefix)
+    for i in range(start, stop):
+        m = h.copy()
+        m.update(b"%d" % i)
+        if m.digest() == target:
+            return i
+    return -1
+
+
+def solve_pow(
+    prefix: str,
+    target: str,
+    *,
+    timeout: float = 30.0,
+    executor: t.Optional[Executor] = None,
+    workers: int = 1,
+    chunk: int = CHUNK,
+    cancel: t.Optional[threading.Event] = None,
+) -> t.Tuple[int, bool]:
+    """Solve a pow challenge. This blocks current thread.
+
+    :param prefix: :obj:`PowCfg.prefix`
+    :param target: :obj:`PowCfg.md5`
+    :param timeout: Calculating timeout in seconds.
+    :param executor: Search chunks concurrently in this executor. If not given, search in current
+        thread.
+    :param workers: Max chunks submitted to the executor at the same time. This should be
+        the number of workers of the executor.
+    :param chunk: Counters searched in one chunk.
+    :param cancel: Stop searching once this event is set.
+    :return: the answer and whether it is found. If not found, the first counter not searched is
+        returned, as the former sequential loop did.
+    """
+    bprefix = prefix.encode()
+    btarget = bytes.fromhex(target)
+    deadline = time() + timeout
+
+    def running():
+        return time() < deadline and not (cancel and cancel.is_set())
+
+    if executor is None:
+        start = 0
+        while running():
+            if (ans := search_range(bprefix, btarget, start, start + chunk)) >= 0:
+                return ans, True
+            start += chunk
+        return start, False
+
+    pending: t.Dict[Future, int] = {}
+    start = 0
+    best = -1
+    try:
+        while True:
+            # keep all workers busy until the answer is found.
+            while best < 0 and len(pending) < workers and running():
+                fut = executor.submit(search_range, bprefix, btarget, start, start + chunk)
+                pending[fut] = start
+                start += chunk
+            if not pending:
+                break
+
+            done, _ = wait(pending, timeout=max(deadline - time(), 0), return_when=FIRST_COMPLETED)
+            if not done or cancel and cancel.is_set():
+                break
+            for fut in done:
+                del pending[fut]
+                if (ans := fut.result()) >= 0 and (best < 0 or ans < best):
+                    best = ans
+            if best >= 0:
+                # chunks before the answer may hold a smaller one. Wait for them only.
+                for fut, s in list(pending.items()):
+                    if s > best:
+                        fut.cancel()
+                        del pending[fut]
+    finally:
+        for fut in pending:
+            fut.cancel()
+
+    if best >= 0:
+        return best, True
+    return start, False
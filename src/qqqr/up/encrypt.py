@@ -7,7 +7,7 @@ from binascii import hexlify
 from contextlib import suppress
 from hashlib import md5
 from random import randint
-from typing import Union
+from typing import Dict, Tuple
 
 from rsa import PublicKey
 from rsa import encrypt as rsa_encrypt
@@ -17,6 +17,21 @@ PUBKEY = PublicKey(
     65537,
 )
 
+try:
+    from cryptography.hazmat.primitives.asymmetric.padding import PKCS1v15
+    from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicNumbers
+except ImportError:
+
+    def _rsa_encrypt(data: bytes) -> bytes:
+        return rsa_encrypt(data, PUBKEY)
+
+else:
+    _PUBKEY = RSAPublicNumbers(PUBKEY.e, PUBKEY.n).public_key()
+
+    def _rsa_encrypt(data: bytes) -> bytes:
+        """PKCS#1 v1.5 rsa encryption with `cryptography`, which is faster than `rsa`."""
+        return _PUBKEY.encrypt(data, PKCS1v15())
+
 
 class PasswdEncoder(ABC):
     def __init__(self, passwd: str) -> None:
@@ -39,37 +54,43 @@ class TeaEncoder(PasswdEncoder):
     .. hint::
 
         For javascript cases, we provide a `TypeScript version <_static/teaencoder.ts>` (testing).
+
+    .. versionchanged:: 1.8.2
+
+        The md5 of password and the tea key of each salt are cached. Tea runs on integers
+        without hex round trips. If `cryptography` is installed (extra ``fast-rsa``), it is used
+        for rsa. Unused helpers ``_tea``, ``_xor``, ``_upper_md5``, ``_int2hex`` and
+        ``_rsa_encrypt`` are removed.
     """
 
     delta = 0x9E3779B9
+    _sums = tuple(map(lambda i: (0x9E3779B9 * i) & 0xFFFFFFFF, range(1, 17)))
+    """the 16 round sums of :obj:`.delta`"""
 
-    @classmethod
-    def _xor(cls, a: bytes, b: bytes):
-        (a1,) = struct.unpack(">Q", a[:8])
-        (b1,) = struct.unpack(">Q", b[:8])
-        r = struct.pack(">Q", a1 ^ b1)
-        return r
+    def __init__(self, passwd: str) -> None:
+        super().__init__(passwd)
+        self._passwd_md5 = md5(passwd.encode()).digest()
+        self._keys: Dict[Tuple[bytes, bool], bytes] = {}
 
     @classmethod
-    def _tea(cls, data: bytes, key: bytes):
-        o, r, a, l = struct.unpack(">LLLL", key[0:16])
-        y, z = struct.unpack(">LL", data[0:8])
-        s = 0
-        for _ in range(16):
-            s += cls.delta
-            s &= 0xFFFFFFFF
-            y += (z << 4) + o ^ z + s ^ (z >> 5) + r
-            y &= 0xFFFFFFFF
-            z += (y << 4) + a ^ y + s ^ (y >> 5) + l
-            z &= 0xFFFFFFFF
-        r = struct.pack(">LL", y, z)
-        return r
+    def _tea_int(cls, v: int, o: int, r: int, a: int, l: int) -> int:
+        """Encrypt a 64-bit block with key ``(o, r, a, l)``."""
+        y, z = v >> 32, v & 0xFFFFFFFF
+        for s in cls._sums:
+            y = (y + ((z << 4) + o ^ z + s ^ (z >> 5) + r)) & 0xFFFFFFFF
+            z = (z + ((y << 4) + a ^ y + s ^ (y >> 5) + l)) & 0xFFFFFFFF
+        return (y << 32) | z
 
     @classmethod
-    def tea_encrypt(cls, data: bytes, key: bytes) -> bytes:
-        data = cls._hex2bytes(data)
-        key = bytes.fromhex(key.decode())
+    def tea_cbc(cls, data: bytes, key: bytes) -> bytes:
+        """Encrypt `data` with the tea variant used by ptlogin. Random fills are prepended.
 
+        :param data: plain bytes.
+        :param key: 16-byte key.
+        :return: cipher bytes.
+
+        .. versionadded:: 1.8.2
+        """
         vl = len(data)
         filln = (vl + 10) % 8
         if filln:
@@ -79,29 +100,21 @@ class TeaEncoder(PasswdEncoder):
         data = fills + data + b"\0" * 7
         assert len(data) % 8 == 0
 
-        last_out = last_in = bytes(8)
-        r = bytearray()
-        for i in range(0, len(data), 8):
-            tmp = cls._xor(data[i : i + 8], last_out)
-            last_out = cls._xor(cls._tea(tmp, key), last_in)
+        k = struct.unpack(">LLLL", key[:16])
+        n = len(data) // 8
+        last_out = last_in = 0
+        r = []
+        for block in struct.unpack(f">{n}Q", data):
+            tmp = block ^ last_out
+            last_out = cls._tea_int(tmp, *k) ^ last_in
             last_in = tmp
-            r.extend(last_out)
-
-        return hexlify(r)
+            r.append(last_out)
+        return struct.pack(f">{n}Q", *r)
 
-    @staticmethod
-    def _upper_md5(raw_str: Union[bytes, str]) -> bytes:
-        if isinstance(raw_str, str):
-            raw_str = raw_str.encode()
-        return md5(raw_str).hexdigest().upper().encode()
-
-    @staticmethod
-    def _rsa_encrypt(data: bytes):
-        return hexlify(rsa_encrypt(data, PUBKEY))
-
-    @staticmethod
-    def _int2hex(ct: int) -> bytes:
-        return hex(ct)[2:].encode()
+    @classmethod
+    def tea_encrypt(cls, data: bytes, key: bytes) -> bytes:
+        """Hex version of :meth:`.tea_cbc`. `data` and `key` are hex strings, so is the result."""
+        return hexlify(cls.tea_cbc(cls._hex2bytes(data), bytes.fromhex(key.decode())))
 
     @staticmethod
     def _hex2bytes(s: bytes):
@@ -119,6 +132,11 @@ class TeaEncoder(PasswdEncoder):
 
             String.fromCharCode(parseInt(double_unsigned, 16))
         """
+        with suppress(ValueError):
+            r = bytes.fromhex(s.decode() if isinstance(s, bytes) else s)
+            # fromhex skips whitespaces, while the javascript code does not.
+            if len(r) * 2 == len(s):
+                return r
         e = []
         for i in range(0, len(s), 2):
             with suppress(ValueError):
@@ -130,23 +148,34 @@ class TeaEncoder(PasswdEncoder):
                 e.append(0)
         return bytes(e)
 
-    async def encode(self, salt: str, verifycode: str, *, is_safe=False) -> str:
+    def _passwd_digest(self, is_safe: bool) -> bytes:
+        if is_safe:
+            # the password is already a md5 hex string.
+            return self._hex2bytes(self._passwd.encode())
+        return self._passwd_md5
+
+    def _key(self, raw_salt: bytes, is_safe: bool) -> bytes:
+        """Tea key of a salt. It only depends on the password and the salt, so it is cached."""
+        if (key := self._keys.get((raw_salt, is_safe))) is None:
+            key = md5(self._passwd_digest(is_safe) + raw_salt).digest()
+            self._keys[(raw_salt, is_safe)] = key
+        return key
+
+    def _plain(self, salt: str, verifycode: str, *, is_safe=False) -> bytes:
+        """Bytes to be encrypted by rsa, i.e. the length-prefixed tea cipher."""
         assert len(self._passwd) >= 8, "password.length in [8, 16]"
+        raw_salt = bytes([ord(i) for i in salt])
         # verifycode先转换为大写，然后转换为bytes
-        vcode = hexlify(verifycode.upper().encode())
+        vcode = verifycode.upper().encode()
 
-        # verifycode length
-        vcode_len = self._int2hex(int(len(vcode) / 2)).zfill(4)
+        data = self._passwd_digest(is_safe) + raw_salt + _len_prefix(vcode)
+        return _len_prefix(self.tea_cbc(data, self._key(raw_salt, is_safe)))
 
-        passwd = self._passwd.encode()
-        if not is_safe:
-            passwd = self._upper_md5(self._passwd)
-
-        raw_salt = bytes([ord(i) for i in salt])
-        p = self._upper_md5(self._hex2bytes(passwd) + raw_salt)
-        enc = self.tea_encrypt(passwd + hexlify(raw_salt) + vcode_len + vcode, p)
+    async def encode(self, salt: str, verifycode: str, *, is_safe=False) -> str:
+        enc = _rsa_encrypt(self._plain(salt, verifycode, is_safe=is_safe))
+        return base64.b64encode(enc, b"*-").decode().replace("=", "_")
 
-        enc_len = self._int2hex(int(len(enc) / 2)).zfill(4)
-        enc = self._rsa_encrypt(self._hex2bytes(enc_len + enc))
 
-        return base64.b64encode(self._hex2bytes(enc), b"*-").decode().replace("=", "_")
+def _len_prefix(b: bytes) -> bytes:
+    """Prefix `b` with its length as a big-endian short."""
+    return struct.pack(">H", len(b)) + b
@@ -13,7 +13,7 @@ from qqqr.base import LoginBase, LoginSession
 from qqqr.constant import StatusCode
 from qqqr.exception import TencentLoginError
 from qqqr.type import APPID, PT_QR_APP, Proxy
-from qqqr.utils.iter import firstn
+from qqqr.utils.hook import answer
 from qqqr.utils.net import ClientAdapter, get_all_cookie
 
 from ._model import CheckResp, LoginResp, RedirectCookies, VerifyResp
@@ -96,9 +96,15 @@ class UpWebSession(LoginSession):
 
 
 class _UpHookMixin:
+    sms_timeout: float = 60
+    """Timeout of :obj:`.sms_code_input`, in seconds.
+
+    .. versionadded:: 1.8.2
+    """
+
     def __init__(self, *args, **kwds) -> None:
         super().__init__(*args, **kwds)
-        self.sms_code_input = MT.sms_code_input.with_timeout(60)
+        self.sms_code_input = MT.sms_code_input.with_timeout(self.sms_timeout)
 
 
 class UpWebLogin(LoginBase[UpWebSession], _UpHookMixin):
@@ -124,12 +130,37 @@ class UpWebLogin(LoginBase[UpWebSession], _UpHookMixin):
         proxy: t.Optional[Proxy] = None,
         info: t.Optional[PT_QR_APP] = None,
         fake_ip: t.Optional[str] = None,
+        *,
+        prefetch_captcha: bool = False,
+        race_hooks: bool = False,
     ):
+        """
+        :param prefetch_captcha: warm up the captcha connection concurrently with :meth:`.check`,
+            for accounts which usually need a captcha.
+        :param race_hooks: take the first acceptable answer of captcha and sms hooks as soon as
+            any impl gives it, and cancel the other impls.
+
+        .. versionchanged:: 1.8.2
+
+            Add `prefetch_captcha` and `race_hooks`.
+        """
         super().__init__(client, uin=uin, h5=h5, app=app, proxy=proxy, info=info)
         self.pwd = pwd
+        self.prefetch_captcha = prefetch_captcha
+        self.race_hooks = race_hooks
+        self.captcha_count = 0
+        """How many captchas are met by this login.
+
+        .. versionadded:: 1.8.2
+        """
+        self._warm_up: t.Optional[asyncio.Future] = None
         self.pwder = TeaEncoder(pwd)
         self.captcha = Captcha(
-            self.client, self.app.appid, str(self.login_page_url), fake_ip=fake_ip
+            self.client,
+            self.app.appid,
+            str(self.login_page_url),
+            fake_ip=fake_ip,
+            race_hooks=race_hooks,
         )
 
     async def new(self):
@@ -249,11 +280,24 @@ class UpWebLogin(LoginBase[UpWebSession], _UpHookMixin):
         return resp
 
     async def login(self):
+        if self.prefetch_captcha and (self._warm_up is None or self._warm_up.done()):
+            # the captcha session needs the sid from check, but the connection can be opened now.
+            self._warm_up = asyncio.ensure_future(self.captcha.warm_up())
+
         sess = await self.new()
+        try:
+            return await self._login(sess)
+        except TencentLoginError:
+            # the sig may be the cause, so it is not shared with later attempts.
+            self._forget_login_sig(sess.login_sig)
+            raise
+
+    async def _login(self, sess: UpWebSession):
         await self.check(sess)
 
         if sess.code == StatusCode.NeedCaptcha:
             log.warning("需通过防水墙")
+            self.captcha_count += 1
 
             try:
                 await sess.pass_vc(self.captcha)
@@ -281,10 +325,15 @@ class UpWebLogin(LoginBase[UpWebSession], _UpHookMixin):
                     raise TencentLoginError(resp.code, "未实现的功能：输入验证码")
                 await self.send_sms_code(sess)
                 with suppress(BaseException):
-                    hook_results = await self.sms_code_input.results(
-                        uin=self.uin, phone=resp.msg, nickname=resp.nickname
+                    sess.sms_code = await answer(
+                        self.sms_code_input,
+                        lambda c: c and len(c.strip()) >= 4,
+                        uin=self.uin,
+                        phone=resp.msg,
+                        nickname=resp.nickname,
+                        racing=self.race_hooks,
+                        timeout=self.sms_timeout,
                     )
-                    sess.sms_code = firstn(hook_results, lambda c: c and len(c.strip()) >= 4)
                 if sess.sms_code is None:
                     raise TencentLoginError(resp.code, "未获得动态(SMS)验证码")
             else:
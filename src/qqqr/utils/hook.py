@@ -0,0 +1,99 @@
+"""Get an answer from the impls of a hook.
+
+By default all impls are waited, and the first acceptable answer in the order of impls is taken.
+In racing mode, the first impl which *finishes* with an acceptable answer wins, and the other
+impls are cancelled. This is useful when a fast solver and a slow human fallback are both
+registered.
+
+.. versionadded:: 1.8.2
+"""
+
+import asyncio
+import logging
+import typing as t
+from contextlib import suppress
+from inspect import isawaitable
+
+from tylisten import HookSpec
+
+from .iter import firstn
+
+__all__ = ["race", "answer"]
+
+T = t.TypeVar("T")
+
+log = logging.getLogger(__name__)
+
+
+async def race(
+    hook: HookSpec[..., T],
+    pred: t.Callable[[T], t.Any],
+    *args,
+    timeout: t.Optional[float] = None,
+    **kwds,
+) -> t.Optional[T]:
+    """Call all impls of `hook` concurrently, return the first result which satisfies `pred` and
+    cancel the rest. Errors of impls are logged and ignored.
+
+    :param hook: the hook.
+    :param pred: the acceptance predicate.
+    :param timeout: seconds to wait for an acceptable answer, default as no limit. Impls are
+        called directly, so pass the timeout which `hook` is created with.
+    :raise `asyncio.TimeoutError`: if no acceptable answer before `timeout`.
+    :return: the first acceptable result, or None if no impl gives one.
+    """
+    loop = asyncio.get_event_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    pending: t.Set[asyncio.Future] = set()
+
+    try:
+        for impl in hook.impls:
+            try:
+                r = impl(*args, **kwds)
+            except BaseException:
+                log.error("sync listener error!", exc_info=True)
+                continue
+            if isawaitable(r):
+                pending.add(asyncio.ensure_future(r))
+            elif pred(r):
+                return r
+
+        while pending:
+            remain = None if deadline is None else max(deadline - loop.time(), 0)
+            done, pending = await asyncio.wait(
+                pending, timeout=remain, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                raise asyncio.TimeoutError
+            for fut in done:
+                if fut.cancelled():
+                    continue
+                if (e := fut.exception()) is not None:
+                    log.error("async listener error!", exc_info=e)
+                    continue
+                if pred(r := fut.result()):
+                    return r
+    finally:
+        for fut in pending:
+            fut.cancel()
+
+
+async def answer(
+    hook: HookSpec[..., T],
+    pred: t.Callable[[T], t.Any],
+    *args,
+    racing: bool = False,
+    timeout: t.Optional[float] = None,
+    **kwds,
+) -> t.Optional[T]:
+    """Get an acceptable answer from `hook`. Timeout is regarded as no answer.
+
+    :param racing: use :func:`race`. Otherwise all impls are waited and the first acceptable
+        result in the order of impls is returned.
+    :param timeout: seconds to wait for an answer, default as no limit.
+    :return: the acceptable answer, or None.
+    """
+    with suppress(asyncio.TimeoutError):
+        if racing:
+            return await race(hook, pred, *args, timeout=timeout, **kwds)
+        return firstn(await asyncio.wait_for(hook.gather(*args, **kwds), timeout), pred)
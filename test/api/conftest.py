@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import io
 from os import environ
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
 
 import pytest
 from PIL import Image as image
 
 from aioqzone.api import UpLoginConfig, UpLoginManager
+from aioqzone.api.login import ConstLoginMan
+from aioqzone.api.login._base import CooldownPolicy
 from qqqr.utils.net import ClientAdapter
 
 if TYPE_CHECKING:
@@ -37,3 +40,41 @@ def man(request, client: ClientAdapter, env: test_env):
         )
 
         return man
+
+
+class FakeLoginMan(ConstLoginMan):
+    """A login manager whose login takes `delay` seconds, then raises `exc` or returns `cookie`.
+    `cookie` defaults to ``{"p_skey": str(uin)}``. Logins are counted in :obj:`.times`, and
+    their start and end are appended to `log`.
+    """
+
+    def __init__(
+        self,
+        uin: int,
+        cookie: Optional[Dict[str, str]] = None,
+        *,
+        delay: float = 0.0,
+        exc: Optional[BaseException] = None,
+        log: Optional[List[Tuple[str, int]]] = None,
+        cooldown_policy: Optional[CooldownPolicy] = None,
+    ) -> None:
+        super().__init__(uin, {"p_skey": str(uin)} if cookie is None else cookie)
+        self.delay = delay
+        self.exc = exc
+        self.log = [] if log is None else log
+        self.cooldown_policy = cooldown_policy
+        self.times = 0
+
+    async def _new_cookie(self):
+        self.times += 1
+        self.log.append(("start", self.uin))
+        await asyncio.sleep(self.delay)
+        self.log.append(("end", self.uin))
+        if self.exc is not None:
+            raise self.exc
+        return self.cookie
+
+
+@pytest.fixture
+def fake_man() -> Type[FakeLoginMan]:
+    return FakeLoginMan
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from aioqzone.api import AccountPool, BatchQrLogin
+from aioqzone.api.login import ConstLoginMan, QrLoginConfig, QrLoginManager
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeQrManager(QrLoginManager):
+    """Scan the QR after `delay` seconds. Accounts with even uin fail."""
+
+    running = 0
+    peak = 0
+
+    def __init__(self, client, config: QrLoginConfig, *, h5=True, delay=0.05):
+        super().__init__(client, config, h5=h5)
+        self.delay = delay
+
+    async def _new_cookie(self):
+        cls = type(self)
+        cls.running += 1
+        cls.peak = max(cls.peak, cls.running)
+        try:
+            self.client.headers["X-Uin"] = str(self.uin)
+            await self.qr_fetched.emit(png=str(self.uin).encode(), times=0)
+            await asyncio.sleep(self.delay * self.uin)
+            assert self.client.headers["X-Uin"] == str(self.uin)
+            if self.uin % 2 == 0:
+                raise RuntimeError(self.uin)
+            return {"p_skey": str(self.uin)}
+        finally:
+            cls.running -= 1
+
+
+async def test_batch():
+    fetched = []
+    configs = [QrLoginConfig(uin=i) for i in range(1, 7)]
+
+    async with AccountPool() as pool:
+        for c in configs:
+            pool.add(lambda client, c=c: FakeQrManager(client, c))
+        batch = BatchQrLogin(pool, concurrency=3)
+        batch.qr_fetched.add_impl(lambda uin, png, times: fetched.append((uin, png)))
+        results = [r async for r in batch.login(configs)]
+
+        assert FakeQrManager.peak == 3
+        # results are yielded as completed
+        assert [r.uin for r in results] == list(range(1, 7))
+        assert sorted(fetched) == [(i, str(i).encode()) for i in range(1, 7)]
+        for r in results:
+            if r.uin % 2:
+                assert r.success and r.cookie == {"p_skey": str(r.uin)}
+                assert batch.pool.accounts[r.uin].logined
+            else:
+                assert isinstance(r.error, RuntimeError)
+
+        # shared connector, isolated clients
+        a, b = batch.pool.accounts[1], batch.pool.accounts[3]
+        assert a.client.connector is b.client.connector
+        assert a.client is not b.client
+
+
+async def test_existing_account():
+    async with AccountPool() as pool:
+        pool.add(lambda client: ConstLoginMan(1))
+        batch = BatchQrLogin(pool)
+        with pytest.raises(TypeError):
+            batch.add(QrLoginConfig(uin=1))
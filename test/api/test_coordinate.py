@@ -0,0 +1,68 @@
+import asyncio
+from pathlib import Path
+from time import time
+from typing import Dict
+
+import pytest
+
+from aioqzone.api.coordinate import CoordinatedLoginMan
+from aioqzone.api.login import Loginable
+from aioqzone.api.store import SqliteCookieStore, StoredCookie
+
+pytestmark = pytest.mark.asyncio
+
+
+class SlowLogin(Loginable):
+    def __init__(self, uin: int, delay: float = 0.2) -> None:
+        super().__init__(uin)
+        self.delay = delay
+        self.times = 0
+
+    async def _new_cookie(self) -> Dict[str, str]:
+        self.times += 1
+        await asyncio.sleep(self.delay)
+        return {"p_skey": str(self.times)}
+
+
+@pytest.fixture
+def store(tmp_path: Path):
+    return SqliteCookieStore(tmp_path / "cookie.db")
+
+
+async def test_share_login(store: SqliteCookieStore):
+    inners = [SlowLogin(1) for _ in range(4)]
+    mans = [CoordinatedLoginMan(i, store, poll_interval=0.05) for i in inners]
+
+    assert all(await asyncio.gather(*(m.new_cookie() for m in mans)))
+    assert sum(i.times for i in inners) == 1
+    assert all(m.cookie == {"p_skey": "1"} for m in mans)
+
+
+async def test_takeover(store: SqliteCookieStore):
+    dead = CoordinatedLoginMan(SlowLogin(1), store, lease_ttl=0.3)
+    assert dead.lease.acquire(1, dead.owner)
+
+    inner = SlowLogin(1, delay=0)
+    man = CoordinatedLoginMan(inner, store, poll_interval=0.05, wait_timeout=2)
+    man.lease.ttl = 0.3
+    assert await man.new_cookie()
+    assert inner.times == 1
+
+
+async def test_timeout(store: SqliteCookieStore):
+    dead = CoordinatedLoginMan(SlowLogin(1), store, lease_ttl=60)
+    assert dead.lease.acquire(1, dead.owner)
+
+    man = CoordinatedLoginMan(SlowLogin(1), store, poll_interval=0.05, wait_timeout=0.2)
+    assert not await man.new_cookie()
+
+
+async def test_stale_store(store: SqliteCookieStore):
+    inner = SlowLogin(1, delay=0)
+    inner.cookie = {"p_skey": "stale"}
+    store.save(1, StoredCookie(dict(inner.cookie), time() - 10))
+
+    man = CoordinatedLoginMan(inner, store, poll_interval=0.05, wait_timeout=2)
+    assert await man.new_cookie()
+    assert inner.times == 1
+    assert man.cookie == {"p_skey": "1"}
@@ -0,0 +1,64 @@
+from time import time
+from unittest.mock import patch
+
+import pytest
+
+from aioqzone.api import QzoneH5API
+from aioqzone.api.keeper import CookieKeeper
+from aioqzone.api.login import ConstLoginMan
+from qqqr.utils.net import ClientAdapter
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def keeper(client: ClientAdapter):
+    man = ConstLoginMan(1, {"p_skey": "a"})
+    return CookieKeeper(QzoneH5API(client, man), probe_interval=100, min_interval=1)
+
+
+async def test_learn_lifetime(keeper: CookieKeeper):
+    assert keeper.lifetime is None
+    assert keeper.next_delay() == 100
+
+    keeper.cookie_born = time() - 50
+    with patch.object(keeper.api, "validate_cookie", return_value=True):
+        assert await keeper.probe()
+
+    keeper.cookie_born = time() - 80
+    with patch.object(keeper.api, "validate_cookie", return_value=False):
+        assert not await keeper.probe()
+
+    assert keeper.lifetime is not None
+    assert 49 < keeper.lifetime < 51, "lower bound is the last valid age"
+
+
+async def test_refresh(keeper: CookieKeeper):
+    keeper.lifetimes.append(100)
+    keeper.cookie_born = time() - 90
+    assert keeper.should_refresh()
+    assert keeper.next_delay() == keeper.min_interval
+
+    with patch.object(keeper.api, "validate_cookie") as probe:
+        await keeper.tick()
+        probe.assert_not_called()
+    await keeper.login.ch_login_notify.wait()
+
+    assert keeper.cookie_age < 1
+    assert not keeper.should_refresh()
+    assert 70 < keeper.next_delay() <= 80
+
+
+async def test_stop(keeper: CookieKeeper):
+    keeper.start()
+    await keeper.stop()
+    assert keeper._on_login_success not in keeper.login.login_success.impls
+
+    keeper.cookie_born = born = time() - 90
+    await keeper.login.new_cookie()
+    await keeper.login.ch_login_notify.wait()
+    assert keeper.cookie_born == born, "a stopped keeper should not track logins"
+
+    keeper.start()
+    await keeper.stop()
+    await keeper.stop()
@@ -15,11 +15,13 @@ from PIL import Image as image
 from tenacity import TryAgain
 
 from aioqzone.api import QrLoginConfig, QrLoginManager, UpLoginConfig, UpLoginManager
+from aioqzone.api.login._base import CooldownPolicy
 from aioqzone.exception import UnexpectedLoginError
 from qqqr.exception import TencentLoginError, UserBreak
 from qqqr.utils.net import ClientAdapter
 
 if TYPE_CHECKING:
+    from test.api.conftest import FakeLoginMan
     from test.conftest import test_env
 
     from qqqr.utils.net import ClientAdapter
@@ -89,7 +91,8 @@ class TestQR:
         ["exc2r", "exc2e"],
         [
             (UserBreak, UserBreak),
-            (asyncio.CancelledError, UserBreak),
+            (KeyboardInterrupt, UserBreak),
+            (asyncio.CancelledError, asyncio.CancelledError),
             (GeneratorExit(), TryAgain),
             (ConnectError("mock"), TryAgain),
             (_fake_http_error, TryAgain),
@@ -120,3 +123,301 @@ class TestQR:
         assert qr.uin == pool[0]
         assert qr.cookie
         assert qr.gtk > 0
+
+
+class TestSigning:
+    async def test_rebuild(self):
+        from aioqzone.api.login import ConstLoginMan
+        from qqqr.utils.encrypt import gtk
+
+        man = ConstLoginMan(1, {"p_skey": "abc", "uin": "o1"})
+        ctx = man.signing
+        assert ctx is man.signing
+        assert ctx.gtk == man.gtk == gtk("abc")
+        assert ctx.cookies == {"p_skey": "abc", "uin": "o1"}
+        with pytest.raises(TypeError):
+            ctx.cookies["p_skey"] = "def"  # type: ignore
+
+        man.cookie = {}
+        assert man.signing.gtk == 0
+        assert man.signing.cookies == {}
+        assert man.signing.generation == ctx.generation + 1
+
+    async def test_waiter_result(self):
+        from aioqzone.api.login import ConstLoginMan
+
+        class SlowLoginMan(ConstLoginMan):
+            async def _new_cookie(self):
+                await asyncio.sleep(0.01)
+                return {"p_skey": "abc"}
+
+        man = SlowLoginMan(1)
+        assert all(await asyncio.gather(man.new_cookie(), man.new_cookie()))
+        assert man.generation == 2
+
+
+class TestCooldown:
+    policy = CooldownPolicy(base=10, factor=2, max=30)
+
+    async def test_fail_fast(self, fake_man: Type[FakeLoginMan]):
+        from aioqzone.exception import LoginCooldown
+
+        man = fake_man(1, exc=TencentLoginError(-3002, "mock"), cooldown_policy=self.policy)
+        assert not await man.new_cookie()
+        with pytest.raises(LoginCooldown) as r:
+            await man.new_cookie()
+        assert man.times == 1
+        assert 0 < r.value.retry_after <= 10
+        assert r.value.failure_class == "TencentLoginError(-3002)"
+
+    async def test_backoff(self, fake_man: Type[FakeLoginMan]):
+        man = fake_man(1, exc=ConnectError("mock"), cooldown_policy=self.policy)
+        durations = []
+        for _ in range(4):
+            man.cooldown_until = 0
+            assert not await man.new_cookie()
+            durations.append(man.cooldown_until - man.last_login)
+        assert [round(i) for i in durations] == [10, 20, 30, 30]
+
+    async def test_reset(self, fake_man: Type[FakeLoginMan]):
+        man = fake_man(1, exc=ConnectError("mock"), cooldown_policy=self.policy)
+        assert not await man.new_cookie()
+        man.cooldown_until = 0
+
+        async def ok():
+            return {"p_skey": "abc"}
+
+        with patch.object(man, "_new_cookie", ok):
+            assert await man.new_cookie()
+        assert man.cooldown_until == 0
+        assert not man._failures
+
+    async def test_opt_in(self, fake_man: Type[FakeLoginMan]):
+        man = fake_man(1, exc=ConnectError("mock"))
+        assert not await man.new_cookie()
+        assert not await man.new_cookie()
+        assert man.times == 2
+        assert man.cooldown_until == 0
+
+
+class TestPathSelector:
+    async def test_choose(self):
+        from aioqzone.api.login.path import PathSelector
+
+        selector = PathSelector(explore=0)
+        assert selector.choose() is True
+        selector.record(True, success=True, elapsed=3, captcha=True)
+        assert selector.choose() is False
+        selector.record(False, success=True, elapsed=5)
+        # a captcha costs more than 2 seconds
+        assert selector.choose() is False
+        for _ in range(3):
+            selector.record(False, success=False, elapsed=10)
+        assert selector.choose() is True
+
+        selector.explore = 1
+        assert selector.choose() is False
+
+    async def test_observe_interrupt(self):
+        from aioqzone.api.login.path import PathSelector
+
+        selector = PathSelector()
+        for exc in (KeyboardInterrupt, asyncio.CancelledError):
+            with pytest.raises(exc), selector.observe(True):
+                raise exc
+        assert selector.stats[True].attempts == 0
+
+    async def test_up_manager(self, client: ClientAdapter):
+        from aioqzone.api.login.path import PathSelector
+        from qqqr.constant import UA, AndroidUA
+        from qqqr.up import UpH5Login, UpWebLogin
+
+        async def h5_login(self: UpWebLogin):
+            assert self.client.headers["User-Agent"] == AndroidUA
+            self.captcha_count += 1
+            return {"p_skey": "h5"}
+
+        async def web_login(self: UpWebLogin):
+            assert self.client.headers["User-Agent"] == UA
+            if not self.sms_code_input.has_impl:
+                raise TencentLoginError(-3002, "hook lost")
+            return {"p_skey": "web"}
+
+        selector = PathSelector(explore=0)
+        man = UpLoginManager(client, UpLoginConfig(uin=1, pwd="pwd"), path_selector=selector)
+        man.sms_code_input.add_impl(lambda uin, phone, nickname: "1234")
+        with patch.object(UpH5Login, "login", h5_login), patch.object(
+            UpWebLogin, "login", web_login
+        ):
+            for p_skey in ("h5", "web", "web"):
+                assert await man.new_cookie()
+                assert man.cookie["p_skey"] == p_skey
+        assert selector.stats[True].captcha > 0
+        assert selector.stats[False].success == pytest.approx(1.9)
+        assert isinstance(man.uplogin, UpWebLogin) and not man.h5_enabled
+        # the client is shared with h5 api calls, which need the mobile user agent
+        assert client.headers["User-Agent"] == AndroidUA
+
+
+class TestChain:
+    async def test_fallback(self, fake_man: Type[FakeLoginMan]):
+        from aioqzone.api.login import ChainLoginMan, LoginTier
+
+        valid = {"p_skey": "up"}
+
+        async def probe(cookie):
+            return cookie == valid
+
+        stored = fake_man(1, {"p_skey": "stale"})
+        up = fake_man(1, valid, delay=0.01)
+        slow = fake_man(1, {"p_skey": "qr"}, delay=1)
+        qr = fake_man(1, {"p_skey": "qr"})
+        chain = ChainLoginMan(
+            1,
+            [
+                LoginTier(stored, probe=probe),
+                LoginTier(slow, budget=0.05),
+                LoginTier(up, budget=1),
+                LoginTier(qr),
+            ],
+        )
+        assert await chain.new_cookie()
+        assert chain.cookie == valid
+        assert chain.last_tier == 2
+        assert (stored.times, slow.times, up.times, qr.times) == (1, 1, 1, 0)
+
+        # the tier worked last time is tried first
+        assert await chain.new_cookie()
+        assert (stored.times, slow.times, up.times, qr.times) == (1, 1, 2, 0)
+
+    async def test_budget(self, fake_man: Type[FakeLoginMan], caplog):
+        from aioqzone.api.login import ChainLoginMan, LoginTier
+
+        slow = fake_man(1, {"p_skey": "slow"}, delay=1, cooldown_policy=CooldownPolicy())
+        failures = []
+        slow.login_failed.add_impl(lambda uin, exc: failures.append(exc))
+        qr = fake_man(1, {"p_skey": "qr"})
+
+        chain = ChainLoginMan(1, [LoginTier(slow, budget=0.05), LoginTier(qr)])
+        caplog.set_level("INFO")
+        assert await chain.new_cookie()
+        assert chain.cookie == {"p_skey": "qr"}
+        assert "exceeds its budget" in caplog.text
+        # giving up a tier is neither a failure nor a reason to cool down
+        await slow.ch_login_notify.wait()
+        assert not failures
+        assert slow.cooldown_until == 0
+
+    async def test_qr_budget(self, client: ClientAdapter, caplog):
+        from aioqzone.api.login import ChainLoginMan, ConstLoginMan, LoginTier
+
+        qr = QrLoginManager(client, QrLoginConfig(uin=1))
+        qr.cooldown_policy = CooldownPolicy()
+        failures = []
+        qr.login_failed.add_impl(lambda uin, exc: failures.append(exc))
+
+        async def slow_login(**kwds):
+            await asyncio.sleep(1)
+
+        chain = ChainLoginMan(
+            1, [LoginTier(qr, budget=0.1), LoginTier(ConstLoginMan(1, {"p_skey": "const"}))]
+        )
+        caplog.set_level("INFO")
+        with patch.object(qr.qrlogin, "login", slow_login):
+            assert await chain.new_cookie()
+        assert chain.cookie == {"p_skey": "const"}
+        assert "exceeds its budget" in caplog.text
+        await qr.ch_login_notify.wait()
+        assert not failures
+        assert qr.cooldown_until == 0
+
+    async def test_all_fail(self, fake_man: Type[FakeLoginMan]):
+        from aioqzone.api.login import ChainLoginMan, LoginTier
+
+        tiers = [
+            LoginTier(fake_man(1, {}, exc=TencentLoginError(-3002, "mock"))) for _ in range(2)
+        ]
+        chain = ChainLoginMan(1, tiers)
+        assert not await chain.new_cookie()
+        assert chain.last_tier is None
+        assert all(t.login.times == 1 for t in tiers)
+
+    async def test_store(self, tmp_path):
+        from aioqzone.api.store import JsonCookieStore, StoreLoginMan
+
+        store = JsonCookieStore(tmp_path / "cookie.json")
+        man = StoreLoginMan(1, store)
+        assert not await man.new_cookie()
+        store.save_behind(1, {"p_skey": "abc"})
+        assert await man.new_cookie()
+        assert man.cookie == {"p_skey": "abc"}
+
+
+class TestScheduler:
+    async def test_cap_and_priority(self, fake_man: Type[FakeLoginMan]):
+        from aioqzone.api.login import LoginScheduler
+
+        log = []
+        scheduler = LoginScheduler(max_concurrency=1)
+        mans = [fake_man(i, delay=0.02, log=log) for i in range(4)]
+        for man in mans:
+            man.scheduler = scheduler
+        # account 3 has requests waiting for its login
+        mans[3].waiting = 2
+
+        assert all(await asyncio.gather(*(m.new_cookie() for m in mans)))
+        starts = [uin for ev, uin in log if ev == "start"]
+        assert starts == [0, 3, 1, 2]
+        # never more than one login at the same time
+        assert all(log[i][0] == "start" and log[i + 1][0] == "end" for i in range(0, 8, 2))
+        assert scheduler.running == 0 and scheduler.queued == 0
+
+    async def test_cancel_queued(self, fake_man: Type[FakeLoginMan]):
+        from aioqzone.api.login import LoginScheduler
+
+        log = []
+        scheduler = LoginScheduler(max_concurrency=1, jitter=0.01)
+        a, b = fake_man(1, delay=0.02, log=log), fake_man(2, delay=0.02, log=log)
+        a.scheduler = b.scheduler = scheduler
+
+        ta = asyncio.ensure_future(a.new_cookie())
+        await asyncio.sleep(0)
+        tb = asyncio.ensure_future(scheduler.acquire(b))
+        await asyncio.sleep(0)
+        assert scheduler.queued == 1
+        tb.cancel()
+        assert await ta
+        assert scheduler.running == 0 and scheduler.queued == 0
+
+    async def test_nested(self, fake_man: Type[FakeLoginMan]):
+        from aioqzone.api.login import ChainLoginMan, LoginScheduler, LoginTier
+
+        scheduler = LoginScheduler(max_concurrency=1)
+        tier = fake_man(1, delay=0.02)
+        chain = ChainLoginMan(1, [LoginTier(tier)])
+        chain.scheduler = tier.scheduler = scheduler
+        assert await asyncio.wait_for(chain.new_cookie(), 1)
+
+    async def test_spawned(self, fake_man: Type[FakeLoginMan]):
+        from aioqzone.api.login import ConstLoginMan, LoginScheduler
+
+        log = []
+        scheduler = LoginScheduler(max_concurrency=1)
+        other = fake_man(2, delay=0.02, log=log)
+        spawned = []
+
+        class SpawningMan(ConstLoginMan):
+            async def _new_cookie(self):
+                log.append(("start", self.uin))
+                # e.g. a hook which logins another account
+                spawned.append(asyncio.ensure_future(other.new_cookie()))
+                await asyncio.sleep(0.02)
+                log.append(("end", self.uin))
+                return {"p_skey": str(self.uin)}
+
+        man = SpawningMan(1)
+        man.scheduler = other.scheduler = scheduler
+        assert await man.new_cookie()
+        assert await spawned[0]
+        # the spawned login of another account is still queued
+        assert log == [("start", 1), ("end", 1), ("start", 2), ("end", 2)]
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from yarl import URL
+
+from aioqzone.api import AccountPool
+from aioqzone.api.login import ConstLoginMan
+from aioqzone.api.pool import Account
+from aioqzone.exception import NoAvailableAccount
+
+pytestmark = pytest.mark.asyncio
+
+QZONE = URL("https://h5.qzone.qq.com/")
+
+
+@pytest_asyncio.fixture
+async def pool():
+    async with AccountPool(max_failures=2) as pool:
+        for uin in (1, 2, 3):
+            pool.add(lambda client, uin=uin: ConstLoginMan(uin, {"p_skey": str(uin)}))
+        yield pool
+
+
+async def test_isolation(pool: AccountPool):
+    a, b, _ = pool.accounts.values()
+    assert a.client.connector is b.client.connector is pool.connector
+    assert a.client.cookie_jar is not b.client.cookie_jar
+
+    a.client.cookie_jar.update_cookies({"p_skey": "a"}, QZONE)
+    b.client.cookie_jar.clear()
+    assert a.client.cookie_jar.filter_cookies(QZONE)["p_skey"].value == "a"
+
+    clients = []
+    with pytest.raises(ValueError):
+        pool.add(lambda client: clients.append(client) or ConstLoginMan(1))
+    # the client of the rejected account is closed, while the shared connector is not
+    assert clients[0].closed
+    assert not pool.connector.closed
+
+
+async def test_distribute(pool: AccountPool):
+    used = []
+
+    async def job(api):
+        used.append(api.login.uin)
+        await asyncio.sleep(0.01)
+        return api.login.uin
+
+    r = await asyncio.gather(*(pool.run(job) for _ in range(6)))
+    assert sorted(r) == sorted(used)
+    assert {1, 2, 3} == set(used)
+    assert all(h.success == 2 and h.inflight == 0 for h in pool.health().values())
+
+
+async def test_health(pool: AccountPool):
+    async def fail(api):
+        raise RuntimeError(api.login.uin)
+
+    for _ in range(6):
+        with pytest.raises(RuntimeError):
+            await pool.run(fail)
+
+    health = pool.health()
+    assert all(h.consecutive_failure == 2 for h in health.values())
+    assert all(isinstance(h.last_error, RuntimeError) for h in health.values())
+    assert not pool.healthy()
+    with pytest.raises(NoAvailableAccount):
+        pool.pick()
+
+    account: Account = pool.accounts[1]
+    await account.login.login_success.emit(1)
+    assert pool.pick() is account
+
+
+async def test_probation(pool: AccountPool):
+    async def fail(api):
+        raise RuntimeError(api.login.uin)
+
+    async def ok(api):
+        return api.login.uin
+
+    for _ in range(6):
+        with pytest.raises(RuntimeError):
+            await pool.run(fail)
+    assert not pool.healthy()
+
+    pool.probation = 0.05
+    await asyncio.sleep(0.1)
+    # one probe job on each account; a failed probe doubles the probation
+    assert len(pool.healthy()) == 3
+    with pytest.raises(RuntimeError):
+        await pool.run(fail)
+    assert len(pool.healthy()) == 2
+
+    uin = await pool.run(ok)
+    assert pool.accounts[uin].health.consecutive_failure == 0
+
+
+async def test_cancel_not_failure(pool: AccountPool):
+    async def hang(api):
+        await asyncio.sleep(10)
+
+    task = asyncio.ensure_future(pool.run(hang))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert all(h.failure == 0 and h.inflight == 0 for h in pool.health().values())
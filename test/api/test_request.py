@@ -0,0 +1,47 @@
+import pytest
+
+from aioqzone.model.api import *
+from aioqzone.model.api.response import UploadPicResponse
+
+_pic = UploadPicResponse.model_validate(
+    dict(
+        filemd5="md5", filelen=1, pre="https://example.com/1.jpg", url="https://example.com/1.jpg"
+    )
+)
+
+samples = [
+    ActiveFeedsParams(attach_info="foo"),
+    GetFeedsParams(hostuin=1, attach_info="foo"),
+    GetFeedsParams(hostuin=1, attach_info="foo", format="jsonp"),
+    ProfileParams(hostuin=1),
+    ShuoshuoParams(fid="fid", uin=1, appid=311),
+    GetCountParams(),
+    DolikeParam(unikey="u", curkey="c", appid=311),
+    AddCommentParams(ownuin=1, fid="fid", private=0, content="foo"),
+    PublishMoodParams(content="foo", sync_weibo=True),
+    DeleteUgcParams(appid=311, fid="fid"),
+    UploadPicParams(picture=b"Zm9v", hd_height=1, hd_width=1),
+    PhotosPreuploadParams(upload_pics=[_pic]),
+]
+
+
+@pytest.mark.parametrize("params", samples, ids=lambda p: type(p).__name__)
+def test_build_params(params: QzoneRequestParams):
+    expect = params.model_dump(mode="json", by_alias=True)
+    expect.update({i: 1 for i in params.uin_fields})
+    got = params.build_params(1, timestamp=1)
+    for i in params.ts_fields:
+        expect[i] = got[i]
+    if isinstance(params, PhotosPreuploadParams):
+        assert set(expect).issubset(got)
+        got = {k: got[k] for k in expect}
+    assert got == expect
+
+
+def test_plan():
+    assert GetCountApi.plan() is GetCountApi.plan()
+    assert GetCountApi().url == GetCountApi.plan().url
+    assert GetCountApi().headers()["Accept"] == "application/json"
+    assert "Connection" not in IndexPageApi().headers()
+    assert IndexPageApi(referer="foo").headers()["Referer"] == "foo"
+    assert UnlikeApi.plan().url != LikeApi.plan().url
@@ -0,0 +1,70 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from aioqzone.api import QzoneH5API
+from aioqzone.api.login import ConstLoginMan
+from aioqzone.api.store import CookieStore, JsonCookieStore, SqliteCookieStore
+from qqqr.utils.net import ClientAdapter
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path: Path):
+    if request.param == "json":
+        return JsonCookieStore(tmp_path / "cookie.json")
+    return SqliteCookieStore(tmp_path / "cookie.db")
+
+
+async def test_write_behind(store: CookieStore):
+    assert await store.aload(1) is None
+    store.save_behind(1, {"p_skey": "a"})
+    store.save_behind(1, {"p_skey": "b"})
+    store.save_behind(2, {"p_skey": "c"})
+    await store.flush()
+
+    assert (await store.aload(1)).cookie == {"p_skey": "b"}  # type: ignore
+    assert store.load(2).cookie == {"p_skey": "c"}  # type: ignore
+
+    await store.adelete(1)
+    assert store.load(1) is None
+
+
+async def test_attach(store: CookieStore):
+    man = ConstLoginMan(1, {"p_skey": "a"})
+    store.attach(man)
+    assert await man.new_cookie()
+    await man.ch_login_notify.wait()
+    await store.flush()
+    assert store.load(1).cookie == {"p_skey": "a"}  # type: ignore
+
+
+async def test_restore(store: CookieStore, client: ClientAdapter):
+    store.save_behind(1, {"p_skey": "a"})
+    await store.flush()
+
+    api = QzoneH5API(client, ConstLoginMan(1))
+    with patch.object(api, "validate_cookie", return_value=True):
+        assert await store.restore(api)
+    assert api.login.cookie == {"p_skey": "a"}
+    assert api.login.last_login > 0
+
+    api = QzoneH5API(client, ConstLoginMan(1))
+    with patch.object(api, "validate_cookie", return_value=False):
+        assert not await store.restore(api)
+    assert not api.login.cookie
+    assert store.load(1) is None
+
+
+async def test_restore_error(store: CookieStore, client: ClientAdapter):
+    store.save_behind(1, {"p_skey": "a"})
+    await store.flush()
+
+    api = QzoneH5API(client, ConstLoginMan(1, {"p_skey": "old"}))
+    with patch.object(api, "validate_cookie", side_effect=ConnectionError):
+        with pytest.raises(ConnectionError):
+            await store.restore(api)
+    assert api.login.cookie == {"p_skey": "old"}
+    assert store.load(1) is not None
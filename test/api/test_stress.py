@@ -0,0 +1,109 @@
+import asyncio
+import typing as t
+
+import pytest
+import pytest_asyncio
+from aiohttp import TCPConnector, web
+from aiohttp.test_utils import TestServer
+
+from aioqzone.api import QzoneH5API
+from aioqzone.api.login import Loginable
+from aioqzone.model.api import GetCountApi
+from qqqr.utils.net import ClientAdapter
+
+pytestmark = pytest.mark.asyncio
+
+
+class StandIn:
+    """A stand-in of mfeeds_get_count. The newest key expires after :obj:`.expire_after`
+    requests. Keys issued by relogin are valid until they are expired."""
+
+    def __init__(self) -> None:
+        self.key = 0
+        self.served = 0
+        self.expired: t.Set[str] = set()
+        self.expire_after: t.Optional[int] = None
+        self.requests = 0
+        self.rejected = 0
+
+    def issue(self) -> str:
+        self.key += 1
+        self.served = 0
+        return str(self.key)
+
+    async def handle(self, request: web.Request):
+        self.requests += 1
+        key = request.cookies.get("p_skey")
+        if self.expire_after is not None and self.served >= self.expire_after:
+            self.expire_after = None
+            self.expired.add(str(self.key))
+        if key is None or key in self.expired:
+            self.rejected += 1
+            if self.rejected % 2:
+                raise web.HTTPForbidden()
+            return web.json_response(dict(code=-3000, message="请重新登录"))
+        self.served += 1
+        await asyncio.sleep(0)
+        return web.json_response(dict(code=0, data=dict(active_cnt=int(key))))
+
+
+class StandInLogin(Loginable):
+    def __init__(self, server: StandIn) -> None:
+        super().__init__(1)
+        self.server = server
+        self.times = 0
+
+    async def _new_cookie(self) -> t.Dict[str, str]:
+        self.times += 1
+        await asyncio.sleep(0.01)
+        return dict(p_skey=self.server.issue())
+
+
+@pytest_asyncio.fixture
+async def standin():
+    standin = StandIn()
+    app = web.Application()
+    app.router.add_get("/feeds/mfeeds_get_count", standin.handle)
+    async with TestServer(app) as server:
+        standin.url = str(server.make_url(""))  # type: ignore
+        yield standin
+
+
+@pytest_asyncio.fixture
+async def api(standin: StandIn):
+    class LocalCountApi(GetCountApi):
+        host: t.ClassVar[str] = standin.url  # type: ignore
+
+    login = StandInLogin(standin)
+    async with ClientAdapter(connector=TCPConnector(limit=0)) as client:
+        api = QzoneH5API(client, login)
+        api.count_api = LocalCountApi  # type: ignore
+        yield api
+
+
+async def test_concurrent_expire(api: QzoneH5API, standin: StandIn):
+    assert await api.login.new_cookie()
+    for _ in range(3):
+        standin.expire_after = 300
+        r = await asyncio.gather(*(api.call(api.count_api()) for _ in range(1000)))  # type: ignore
+        assert len(r) == 1000
+        assert all(i.active_cnt > 0 for i in r)
+
+    assert standin.rejected > 0
+    # the dispatch gate ensures one relogin for each expiration
+    assert t.cast(StandInLogin, api.login).times == 1 + 3
+    # only in-flight requests are rejected, and each of them is replayed once
+    assert standin.requests == 3000 + standin.rejected
+
+
+async def test_jar_conflict(api: QzoneH5API, standin: StandIn):
+    from yarl import URL
+
+    assert await api.login.new_cookie()
+    # a stale key left in the jar, e.g. by a former login flow
+    standin.expired.add("stale")
+    api.client.cookie_jar.update_cookies({"p_skey": "stale"}, URL(standin.url))
+
+    r = await api.call(api.count_api())  # type: ignore
+    assert r.active_cnt == standin.key
+    assert standin.rejected == 0
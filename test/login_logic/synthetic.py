@@ -0,0 +1,56 @@
+"""Synthetic slide captchas to test and benchmark :mod:`qqqr.up.captcha.slide.solver`.
+This requires NumPy."""
+
+import typing as t
+
+import numpy as np
+from PIL import Image as image
+from PIL import ImageDraw, ImageFilter
+
+__all__ = ["jigsaw"]
+
+
+def jigsaw(
+    seed: int, W: int = 672, H: int = 390, size: int = 120, dim: float = 0.5
+) -> t.Tuple[image.Image, image.Image, t.Tuple[int, int], int]:
+    """Generate a synthetic slide captcha: a textured background with a dimmed, light-bordered
+    gap, and the piece cut from the gap.
+
+    :return: background, piece, init_pos and the left of the gap.
+    """
+    rng = np.random.default_rng(seed)
+    low = rng.random((H // 30 + 2, W // 30 + 2, 3)) * 255
+    bg = image.fromarray(low.astype(np.uint8)).resize((W, H), image.BICUBIC)
+    d = ImageDraw.Draw(bg)
+    for _ in range(40):
+        x, y, r = rng.integers(0, W), rng.integers(0, H), rng.integers(5, 60)
+        c = tuple(int(i) for i in rng.integers(0, 256, 3))
+        (d.ellipse if rng.random() < 0.5 else d.rectangle)((x - r, y - r, x + r, y + r), fill=c)
+    arr = np.asarray(bg.filter(ImageFilter.GaussianBlur(1))).astype(np.float32)
+    arr += rng.normal(0, 6, arr.shape)
+    bg = image.fromarray(arr.clip(0, 255).astype(np.uint8)).convert("RGBA")
+
+    # a square body with a knob on the top and on the right
+    mask = image.new("L", (size, size), 0)
+    md = ImageDraw.Draw(mask)
+    b, k = size // 6, size // 8
+    md.rectangle((b, b, size - b - 1, size - b - 1), fill=255)
+    md.ellipse((size // 2 - k, b - k - k // 2, size // 2 + k, b + k), fill=255)
+    md.ellipse((size - b - k, size // 2 - k, size - b + k + k // 2, size // 2 + k), fill=255)
+
+    top = int(rng.integers(10, H - size - 10))
+    left = int(rng.integers(20, 60))
+    gap = int(rng.integers(left + size, W - size - 10))
+    box = (gap, top, gap + size, top + size)
+
+    piece = bg.crop(box)
+    piece.putalpha(mask)
+
+    empty = image.new("RGBA", (size, size))
+    shade = image.composite(
+        image.new("RGBA", (size, size), (0, 0, 0, int(255 * dim))), empty, mask
+    )
+    border = image.new("RGBA", (size, size), (255, 255, 255, 120))
+    border = image.composite(border, empty, mask.filter(ImageFilter.FIND_EDGES))
+    bg.paste(image.alpha_composite(image.alpha_composite(bg.crop(box), shade), border), box[:2])
+    return bg.convert("RGB"), piece, (left, top), gap
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
+from time import time
+from types import SimpleNamespace
 from typing import TYPE_CHECKING, Tuple
+from unittest.mock import AsyncMock, patch
 
 import pytest
 import pytest_asyncio
@@ -9,6 +13,7 @@ import pytest_asyncio
 from qqqr.constant import captcha_status_description
 from qqqr.up import UpH5Login
 from qqqr.up.captcha import Captcha, SelectCaptchaSession, TcaptchaSession
+from qqqr.up.captcha._model import PowCfg
 
 if TYPE_CHECKING:
     from test.conftest import test_env
@@ -104,3 +109,84 @@ class TestCaptcha:
             return
 
         pytest.fail(msg=captcha_status_description.get(r.code))
+
+
+class HopelessSession:
+    """A captcha session whose captcha cannot be solved, whose tdc never completes and whose pow
+    has no answer."""
+
+    data_type = "DynAnswerType_UC"
+    conf = SimpleNamespace(common=SimpleNamespace(pow_cfg=PowCfg(prefix="0#", md5="0" * 32)))
+    solve_workload = TcaptchaSession.solve_workload
+
+    async def get_captcha_problem(self, client):
+        pass
+
+    async def solve_captcha(self):
+        return ""
+
+    async def get_tdc(self, client, ip=None):
+        await asyncio.Event().wait()
+
+
+async def test_verify_short_circuit(client: ClientAdapter):
+    captcha = Captcha(client, 716027609, "https://xui.ptlogin2.qq.com/")
+    sess = HopelessSession()
+    start = time()
+    with patch.object(captcha, "new", AsyncMock(return_value=sess)):
+        with pytest.raises(NotImplementedError):
+            await captcha.verify("sid")
+    assert time() - start < 1
+
+    # the pow thread stops at the next chunk
+    await asyncio.sleep(0.5)
+    assert sess.duration < 1000  # type: ignore
+
+
+async def test_select_cdn_imgs():
+    import json
+
+    from PIL import Image as image
+
+    from qqqr.up.captcha._model import PrehandleResp
+    from qqqr.up.captcha.pil_utils import tobytes
+
+    regions = [dict(id=i, range=[i * 10, 0, i * 10 + 10, 10]) for i in range(1, 4)]
+    payload = dict(select_region_list=regions, prompt_id=1, picture_ids=[3, 1, 2])
+    prehandle = PrehandleResp.model_validate(
+        dict(
+            sess="sess",
+            data=dict(
+                comm_captcha_cfg=dict(pow_cfg=dict(prefix="0#", md5="0" * 32), tdc_path="/"),
+                dyn_show_info=dict(
+                    instruction="foo",
+                    bg_elem_cfg=dict(
+                        size_2d=[40, 10],
+                        sprite_pos=[0, 0],
+                        img_url="/bg",
+                        click_cfg=dict(mark_style="", data_type=["DynAnswerType_POS"]),
+                    ),
+                    verify_trigger_cfg={},
+                    color_scheme="",
+                    json_payload=json.dumps(payload),
+                ),
+            ),
+        )
+    )
+    sess = SelectCaptchaSession("sid", prehandle)
+
+    class FakeResponse:
+        content = SimpleNamespace(read=AsyncMock(return_value=tobytes(image.new("RGB", (40, 10)))))
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            pass
+
+    client = SimpleNamespace(get=lambda url: FakeResponse())
+    await sess.get_captcha_problem(client)  # type: ignore
+    assert len(sess.cdn_images) == 3
+    # png bytes are still available after the problem is fetched, encoded on first access
+    assert sess._cdn_imgs is None
+    assert len(sess.cdn_imgs) == 3 and all(i.startswith(b"\x89PNG") for i in sess.cdn_imgs)
@@ -0,0 +1,143 @@
+import base64
+import importlib
+import random
+import struct
+import sys
+from binascii import hexlify
+from hashlib import md5
+from random import randint
+from unittest.mock import patch
+
+import pytest
+import rsa
+
+from qqqr.up import encrypt
+from qqqr.up.encrypt import TeaEncoder
+
+
+def legacy_tea_encrypt(data: bytes, key: bytes) -> bytes:
+    """The tea implementation before integer blocks, as a reference."""
+    data = TeaEncoder._hex2bytes(data)
+    o, r, a, l = struct.unpack(">LLLL", bytes.fromhex(key.decode()))
+
+    def tea(block: bytes):
+        y, z = struct.unpack(">LL", block)
+        s = 0
+        for _ in range(16):
+            s = (s + TeaEncoder.delta) & 0xFFFFFFFF
+            y = (y + ((z << 4) + o ^ z + s ^ (z >> 5) + r)) & 0xFFFFFFFF
+            z = (z + ((y << 4) + a ^ y + s ^ (y >> 5) + l)) & 0xFFFFFFFF
+        return struct.pack(">LL", y, z)
+
+    def xor(a: bytes, b: bytes):
+        return bytes(i ^ j for i, j in zip(a, b))
+
+    filln = (len(data) + 10) % 8
+    if filln:
+        filln = 8 - filln
+    fills = bytes([0xF8 & randint(0, 0xFF) | filln])
+    fills += bytes(randint(0, 0xFF) for _ in range(filln + 2))
+    data = fills + data + b"\0" * 7
+
+    last_out = last_in = bytes(8)
+    out = bytearray()
+    for i in range(0, len(data), 8):
+        tmp = xor(data[i : i + 8], last_out)
+        last_out = xor(tea(tmp), last_in)
+        last_in = tmp
+        out.extend(last_out)
+    return hexlify(out)
+
+
+def legacy_plain(passwd: str, salt: str, verifycode: str) -> bytes:
+    """Bytes passed to rsa by the encoder before cached derivations, as a reference."""
+    vcode = hexlify(verifycode.upper().encode())
+    vcode_len = hex(len(vcode) // 2)[2:].encode().zfill(4)
+    upper_md5 = lambda b: md5(b).hexdigest().upper().encode()
+    pwd = upper_md5(passwd.encode())
+    raw_salt = bytes([ord(i) for i in salt])
+    p = upper_md5(TeaEncoder._hex2bytes(pwd) + raw_salt)
+    enc = legacy_tea_encrypt(pwd + hexlify(raw_salt) + vcode_len + vcode, p)
+    enc_len = hex(len(enc) // 2)[2:].encode().zfill(4)
+    return TeaEncoder._hex2bytes(enc_len + enc)
+
+
+SALT = "\x00\x00\x00\x00\x07\x5b\xcd\x15"
+
+
+@pytest.mark.parametrize("n", [0, 1, 5, 6, 7, 8, 16, 33, 100])
+def test_tea_exact(n: int):
+    rng = random.Random(n)
+    data = hexlify(bytes(rng.randrange(256) for _ in range(n)))
+    key = hexlify(bytes(rng.randrange(256) for _ in range(16)))
+    random.seed(n)
+    expected = legacy_tea_encrypt(data, key)
+    random.seed(n)
+    assert TeaEncoder.tea_encrypt(data, key) == expected
+
+
+@pytest.mark.parametrize("vcode", ["!ABC", "!xyz", "x" * 40])
+def test_plain_exact(vcode: str):
+    encoder = TeaEncoder("password123")
+    for seed in range(3):
+        random.seed(seed)
+        expected = legacy_plain("password123", SALT, vcode)
+        random.seed(seed)
+        assert encoder._plain(SALT, vcode) == expected
+
+
+@pytest.mark.asyncio
+async def test_encode():
+    encoder = TeaEncoder("password123")
+    random.seed(0)
+    plain = legacy_plain("password123", SALT, "!ABC")
+    random.seed(0)
+    with patch.object(encrypt, "_rsa_encrypt", lambda b: b):
+        p = await encoder.encode(SALT, "!ABC")
+    assert base64.b64decode(p.replace("_", "="), b"*-") == plain
+
+    p = await encoder.encode(SALT, "!ABC")
+    assert len(base64.b64decode(p.replace("_", "="), b"*-")) == 256
+
+
+@pytest.fixture(scope="module")
+def rsa_key():
+    return rsa.newkeys(1024)
+
+
+@pytest.fixture(params=["rsa", "cryptography"])
+def backend(request):
+    """Reload :mod:`qqqr.up.encrypt` with the given rsa backend."""
+    vars(encrypt).pop("_PUBKEY", None)
+    if request.param == "cryptography":
+        pytest.importorskip("cryptography")
+        yield importlib.reload(encrypt)
+    else:
+        with patch.dict(sys.modules, {"cryptography.hazmat.primitives.asymmetric.padding": None}):
+            yield importlib.reload(encrypt)
+    importlib.reload(encrypt)
+
+
+@pytest.mark.asyncio
+async def test_rsa_backend(backend, rsa_key):
+    pub, priv = rsa_key
+    keys = dict(PUBKEY=pub)
+    if hasattr(backend, "_PUBKEY"):
+        from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicNumbers
+
+        keys["_PUBKEY"] = RSAPublicNumbers(pub.e, pub.n).public_key()
+
+    encoder = backend.TeaEncoder("password123")
+    random.seed(0)
+    plain = legacy_plain("password123", SALT, "!ABC")
+    random.seed(0)
+    with patch.multiple(backend, **keys):
+        p = await encoder.encode(SALT, "!ABC")
+    assert rsa.decrypt(base64.b64decode(p.replace("_", "="), b"*-"), priv) == plain
+
+
+def test_hex2bytes():
+    assert TeaEncoder._hex2bytes(b"0aff") == b"\x0a\xff"
+    assert TeaEncoder._hex2bytes(b"1g") == b"\x01"
+    assert TeaEncoder._hex2bytes(b"g1") == b"\x00"
+    assert TeaEncoder._hex2bytes(b"1 2 ") == b"\x01\x02"
@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import io
 from os import environ
+from time import time
 from typing import TYPE_CHECKING, Optional
 
 import pytest
@@ -10,8 +11,9 @@ import pytest_asyncio
 from PIL import Image as image
 
 from qqqr.constant import StatusCode
-from qqqr.exception import UserBreak
-from qqqr.qr import QrLogin, QrSession
+from qqqr.exception import UserBreak, UserTimeout
+from qqqr.qr import QR, QrLogin, QrSession
+from qqqr.qr.type import PollResp
 
 pytestmark = pytest.mark.asyncio
 skip_ci = pytest.mark.skipif(bool(environ.get("CI")), reason="Skip QR loop in CI")
@@ -82,3 +84,111 @@ class TestLoop:
         assert isinstance(hist[1], (bytes, NoneType))
         assert type(hist[0]) == type(hist[1])
         assert hist[0] != hist[1]
+
+
+class FakeQrLogin(QrLogin):
+    """A QrLogin whose QR never leaves this process. Poll results are taken from `codes`."""
+
+    def __init__(self, client: ClientAdapter, codes=()):
+        super().__init__(client, 1)
+        self.codes = list(codes)
+        self.polls = []
+        self.shows = 0
+
+    async def show(self, push_qr=False):
+        self.shows += 1
+        return QR(b"png", sig=str(self.shows))
+
+    async def new(self):
+        return QrSession(await self.show(), login_sig="sig")
+
+    async def poll(self, sess: QrSession):
+        self.polls.append(sess.current_qr.age())
+        code = self.codes.pop(0) if self.codes else StatusCode.Waiting
+        return PollResp(code=code, url="", msg="", nickname="")
+
+
+class TestAdaptivePoll:
+    async def test_cancel_wakeup(self, client: ClientAdapter):
+        login = FakeQrLogin(client)
+        asyncio.get_event_loop().call_later(0.05, login.cancel.set)
+        start = time()
+        with pytest.raises(UserBreak):
+            await login.login(poll_freq=10, fast_poll_freq=10)
+        assert time() - start < 1
+        assert not login.polls
+
+    async def test_refresh_wakeup(self, client: ClientAdapter):
+        login = FakeQrLogin(client)
+
+        def _fetched(png, times, qr_renew=False):
+            if qr_renew:
+                login.cancel.set()
+
+        login.qr_fetched.add_impl(_fetched)
+        asyncio.get_event_loop().call_later(0.05, login.refresh.set)
+        with pytest.raises(UserBreak):
+            await asyncio.wait_for(login.login(poll_freq=10, fast_poll_freq=10), 1)
+        assert login.shows == 2
+
+    async def test_fast_then_slow(self, client: ClientAdapter):
+        login = FakeQrLogin(client)
+        with pytest.raises(UserTimeout):
+            await login.login(
+                refresh_times=1,
+                poll_freq=0.1,
+                fast_poll_freq=0.02,
+                fast_period=0.1,
+                qr_lifetime=0.5,
+            )
+        fast = [i for i in login.polls if i < 0.1]
+        slow = [i for i in login.polls if i >= 0.1]
+        assert len(fast) >= 3
+        assert 3 <= len(slow) <= 5
+        # an expired qr is never polled
+        assert max(login.polls) < 0.5
+
+    async def test_scanned_fast(self, client: ClientAdapter):
+        login = FakeQrLogin(client, [StatusCode.Waiting, StatusCode.Scanned])
+        with pytest.raises(UserTimeout):
+            await login.login(
+                refresh_times=1, poll_freq=0.2, fast_poll_freq=0.02, fast_period=0, qr_lifetime=0.5
+            )
+        # waiting: slow; scanned: fast
+        assert login.polls[1] - login.polls[0] >= 0.15
+        assert login.polls[2] - login.polls[1] < 0.1
+
+    async def test_scanned_slow_confirm(self, client: ClientAdapter):
+        login = FakeQrLogin(client, [StatusCode.Scanned] * 8 + [StatusCode.Expired])
+        with pytest.raises(UserTimeout):
+            await login.login(
+                refresh_times=1, poll_freq=0.2, fast_poll_freq=0.05, fast_period=1, qr_lifetime=0.2
+            )
+        # a scanned qr is not expired locally, the server decides
+        assert len(login.polls) == 9
+        assert max(login.polls) > 0.2
+
+    async def test_hook_nonblocking(self, client: ClientAdapter, caplog):
+        login = FakeQrLogin(client)
+        hooked = asyncio.Event()
+
+        async def _slow(png, times, qr_renew=False):
+            await asyncio.sleep(0.5)
+
+        async def _bad(png, times, qr_renew=False):
+            hooked.set()
+            raise ValueError("hook failed")
+
+        login.qr_fetched.add_impl(_slow)
+        login.qr_fetched.add_impl(_bad)
+        with pytest.raises(UserTimeout):
+            await login.login(
+                refresh_times=1, poll_freq=0.1, fast_poll_freq=0.02, fast_period=1, qr_lifetime=0.2
+            )
+        assert hooked.is_set()
+        # the first poll is not delayed by the slow hook
+        assert login.polls and login.polls[0] < 0.2
+        # deliveries are still running, and errors are logged once they finish
+        assert login.ch_qr_notify
+        await login.ch_qr_notify.wait()
+        assert "hook failed" in caplog.text
@@ -0,0 +1,98 @@
+import asyncio
+from typing import Tuple
+
+import pytest
+from PIL import Image as image
+
+from qqqr.up.captcha.pil_utils import tobytes
+from qqqr.up.captcha.slide.solver import locate_gap, solve_slide
+
+pytest.importorskip("numpy")
+
+from .synthetic import jigsaw  # noqa: E402
+
+
+def test_accuracy():
+    n, hit = 40, 0
+    for seed in range(n):
+        bg, piece, init_pos, gap = jigsaw(seed)
+        x = locate_gap(bg, piece, init_pos)
+        assert x > init_pos[0]
+        hit += abs(x - gap) <= 3
+    assert hit / n >= 0.9
+
+
+def test_bytes():
+    bg, piece, init_pos, gap = jigsaw(0)
+    assert abs(solve_slide(tobytes(bg), tobytes(piece), init_pos) - gap) <= 3
+
+
+def slide_session(piece: image.Image, init_pos: Tuple[int, int]):
+    from qqqr.up.captcha._model import PrehandleResp
+    from qqqr.up.captcha.slide import SlideCaptchaSession
+
+    sprite = dict(size_2d=list(piece.size), sprite_pos=[0, 0])
+    prehandle = PrehandleResp.model_validate(
+        dict(
+            sess="sess",
+            data=dict(
+                comm_captcha_cfg=dict(pow_cfg=dict(prefix="0#", md5="0" * 32), tdc_path="/"),
+                dyn_show_info=dict(
+                    bg_elem_cfg=dict(size_2d=[672, 390], sprite_pos=[0, 0], img_url="/bg"),
+                    sprite_url="/sprite",
+                    fg_elem_list=[
+                        dict(
+                            id=1,
+                            init_pos=list(init_pos),
+                            move_cfg=dict(track_limit="", move_factor=[1, 0]),
+                            **sprite,
+                        )
+                    ],
+                ),
+            ),
+        )
+    )
+    return SlideCaptchaSession("sid", prehandle)
+
+
+@pytest.mark.asyncio
+async def test_session_hooks():
+    from qqqr.message import solve_slide_captcha, solve_slide_captcha_image
+
+    bg, piece, init_pos, gap = jigsaw(1)
+    sess = slide_session(piece, init_pos)
+    sess.cdn_imgs = [tobytes(bg), tobytes(piece)]
+    sess.solve_captcha_hook = solve_slide_captcha.with_timeout(60)
+    sess.solve_image_hook = solve_slide_captcha_image.with_timeout(60)
+
+    # no hooks: the built-in solver is used
+    x, y = map(int, (await sess.solve_captcha()).split(","))
+    assert abs(x - gap) <= 3 and y == init_pos[1]
+
+    received = []
+    sess.mouse_track = asyncio.get_event_loop().create_future()
+    sess.solve_image_hook.add_impl(lambda b, p, pos: received.append((b, p)) or gap)
+    sess.solve_captcha_hook.add_impl(lambda b, p, pos: pytest.fail("png hook is asked"))
+    assert await sess.solve_captcha() == f"{gap},{init_pos[1]}"
+    ((b, p),) = received
+    assert isinstance(b, image.Image) and b.size == bg.size
+    assert isinstance(p, image.Image) and p.size == piece.size
+
+
+@pytest.mark.asyncio
+async def test_hooks_fallback():
+    from qqqr.message import solve_slide_captcha, solve_slide_captcha_image
+
+    bg, piece, init_pos, gap = jigsaw(2)
+    sess = slide_session(piece, init_pos)
+    sess.cdn_imgs = [tobytes(bg), tobytes(piece)]
+    sess.mouse_track = asyncio.get_event_loop().create_future()
+    sess.solve_captcha_hook = solve_slide_captcha.with_timeout(60)
+    sess.solve_image_hook = solve_slide_captcha_image.with_timeout(60)
+    sess.race_hooks = True
+
+    # hooks give no acceptable answer: the built-in solver is used
+    sess.solve_image_hook.add_impl(lambda b, p, pos: 0)
+    sess.solve_captcha_hook.add_impl(lambda b, p, pos: 0)
+    x, y = map(int, (await sess.solve_captcha()).split(","))
+    assert abs(x - gap) <= 3 and y == init_pos[1]
@@ -0,0 +1,91 @@
+import threading
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import cast
+
+import pytest
+
+from qqqr.up.captcha.tdc import TdcCache
+from qqqr.utils.net import ClientAdapter
+
+no_network = cast(ClientAdapter, None)
+
+
+def test_lru():
+    cache = TdcCache(maxsize=2)
+    cache.put("/a", "foo")
+    cache.put("/b", "foo")
+    assert len(cache._scripts) == 1, "same script should be shared"
+
+    assert cache.get("/a") == "foo"
+    cache.put("/c", "bar")
+    assert cache.get("/b") is None
+    assert cache.get("/a") == "foo"
+    assert len(cache) == 2
+
+    cache.put("/d", "baz")
+    assert cache.get("/c") is None
+    assert set(cache._scripts.values()) == {"foo", "baz"}
+
+
+@pytest.mark.asyncio
+async def test_fetch(tmp_path: Path):
+    cache = TdcCache(tmp_path)
+    cache.put("/tdc.js?t=1", "foo")
+    assert await cache.fetch(no_network, "/tdc.js?t=1") == "foo"
+
+    cache.save("/tdc.js?t=1", "foo")
+    cache = TdcCache(tmp_path)
+    assert cache.get("/tdc.js?t=1") is None
+    assert await cache.fetch(no_network, "/tdc.js?t=1") == "foo"
+    assert cache.get("/tdc.js?t=1") == "foo"
+
+
+@pytest.mark.asyncio
+async def test_off_loop():
+    from qqqr.up.captcha.capsess import BaseTcaptchaSession
+
+    loop_thread = threading.get_ident()
+
+    class FakeTdc:
+        def getData(self, *_):
+            assert threading.get_ident() != loop_thread
+            return "a%3Db"
+
+        def getInfo(self, *_):
+            assert threading.get_ident() != loop_thread
+            return {"info": "'eks'"}
+
+    sess = cast(BaseTcaptchaSession, SimpleNamespace(tdc=FakeTdc()))
+    assert await BaseTcaptchaSession.get_tdc_data(sess) == "a=b"
+    assert await BaseTcaptchaSession.get_tdc_info(sess) == "'eks'"
+
+
+@pytest.mark.asyncio
+async def test_single_flight():
+    import asyncio
+
+    class FakeResponse:
+        def raise_for_status(self):
+            pass
+
+        async def text(self, encoding):
+            await asyncio.sleep(0.05)
+            return "foo"
+
+    class FakeClient:
+        gets = 0
+
+        @asynccontextmanager
+        async def get(self, url):
+            self.gets += 1
+            yield FakeResponse()
+
+    client = FakeClient()
+    cache = TdcCache()
+    url = "https://t.captcha.qq.com/tdc.js?t=1"
+    r = await asyncio.gather(*(cache.fetch(cast(ClientAdapter, client), url) for _ in range(4)))
+    assert r == ["foo"] * 4
+    assert client.gets == 1
+    assert not cache._inflight
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 from os import environ
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 import pytest_asyncio
@@ -101,3 +103,83 @@ async def test_h5_login(h5: UpH5Login):
 
     assert cookies["p_skey"]
     # assert cookies["pt_guid_sig"]
+
+
+async def test_prefetch_captcha(client: ClientAdapter):
+    from qqqr.up.web import UpWebSession
+
+    login = UpWebLogin(client, 1, "password", prefetch_captcha=True)
+    events = []
+
+    async def warm_up():
+        events.append("warm_up start")
+        await asyncio.sleep(0.01)
+        events.append("warm_up end")
+
+    async def new():
+        return UpWebSession("sig")
+
+    async def check(sess):
+        events.append("check")
+        await asyncio.sleep(0.02)
+        events.append("check end")
+        raise TencentLoginError(StatusCode.RiskyNetwork, "mock")
+
+    with patch.object(login.captcha, "warm_up", warm_up), patch.object(
+        login, "new", new
+    ), patch.object(login, "check", check), pytest.raises(TencentLoginError):
+        await login.login()
+    # warming up runs concurrently with check
+    assert events.index("warm_up end") < events.index("check end")
+
+
+async def test_login_sig_cache():
+    from contextlib import asynccontextmanager
+    from http.cookies import SimpleCookie
+    from types import SimpleNamespace
+
+    from yarl import URL
+
+    from qqqr import base
+    from qqqr.type import PT_QR_APP
+    from qqqr.utils.net import ClientAdapter
+
+    gets = []
+
+    @asynccontextmanager
+    async def get(url, **kwds):
+        gets.append(url)
+        cookies = SimpleCookie()
+        cookies["pt_login_sig"] = f"sig{len(gets)}"
+        cookies["pt_login_sig"]["domain"] = "ptlogin2.qq.com"
+        cookies["pt_login_sig"]["path"] = "/"
+        yield SimpleNamespace(cookies=cookies, url=URL(url), raise_for_status=lambda: None)
+
+    base._login_sig_cache.clear()
+    async with ClientAdapter() as c1, ClientAdapter() as c2:
+        a, b = UpWebLogin(c1, 1, "pwd"), UpWebLogin(c2, 2, "pwd")
+        with patch.object(c1, "get", get), patch.object(c2, "get", get):
+            assert (await a.new()).login_sig == "sig1"
+            assert (await a.new()).login_sig == "sig1"
+            # another account reuses the sig, along with the cookie
+            assert (await b.new()).login_sig == "sig1"
+            jar = c2.cookie_jar.filter_cookies(URL("https://ssl.ptlogin2.qq.com"))
+            assert jar["pt_login_sig"].value == "sig1"
+            assert len(gets) == 1
+
+            # other app does not share the sig
+            assert (await UpWebLogin(c2, 2, "pwd", h5=False).new()).login_sig == "sig2"
+
+            # other info does not share the sig either
+            info = PT_QR_APP(app="other")
+            assert (await UpWebLogin(c2, 2, "pwd", info=info).new()).login_sig == "sig3"
+
+            # a failed login drops the sig
+            with patch.object(a, "_login", side_effect=TencentLoginError(-3000, "mock")):
+                with pytest.raises(TencentLoginError):
+                    await a.login()
+            assert (await b.new()).login_sig == "sig4"
+
+            a.login_sig_ttl = 0
+            assert (await a.new()).login_sig == "sig5"
+    base._login_sig_cache.clear()
@@ -0,0 +1,62 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from hashlib import md5
+from time import time
+
+import pytest
+
+from qqqr.up.captcha.workload import search_range, solve_pow
+
+PREFIX = "0a1b2c3d4e5f#"
+
+
+def _target(ans: int):
+    return md5(f"{PREFIX}{ans}".encode()).hexdigest()
+
+
+@pytest.mark.parametrize("ans", [0, 7, 12345, 70001])
+def test_sequential(ans: int):
+    assert solve_pow(PREFIX, _target(ans), chunk=1000) == (ans, True)
+
+
+def test_search_range():
+    target = bytes.fromhex(_target(500))
+    assert search_range(PREFIX.encode(), target, 0, 500) == -1
+    assert search_range(PREFIX.encode(), target, 500, 501) == 500
+
+
+def test_upper_target():
+    assert solve_pow(PREFIX, _target(42).upper()) == (42, True)
+
+
+def test_timeout():
+    ans, found = solve_pow(PREFIX, "0" * 32, timeout=0.05, chunk=1000)
+    assert not found
+    assert ans > 0 and ans % 1000 == 0
+
+
+@pytest.mark.parametrize("executor_cls", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_parallel(executor_cls):
+    with executor_cls(max_workers=2) as executor:
+        for ans in [3, 4999, 5000, 23456]:
+            r = solve_pow(PREFIX, _target(ans), executor=executor, workers=4, chunk=1000)
+            assert r == (ans, True)
+
+        ans, found = solve_pow(
+            PREFIX, "0" * 32, timeout=0.05, executor=executor, workers=4, chunk=1000
+        )
+        assert not found
+
+
+def test_cancel():
+    cancel = threading.Event()
+    cancel.set()
+    assert solve_pow(PREFIX, "0" * 32, chunk=1000, cancel=cancel) == (0, False)
+
+    cancel = threading.Event()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        threading.Timer(0.05, cancel.set).start()
+        start = time()
+        _, found = solve_pow(PREFIX, "0" * 32, executor=executor, chunk=1000, cancel=cancel)
+        assert not found
+        assert time() - start < 1
@@ -0,0 +1,70 @@
+import asyncio
+from time import time
+
+import pytest
+
+import qqqr.message as MT
+from qqqr.utils.hook import answer, race
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_race_first_wins():
+    hook = MT.sms_code_input.with_timeout(5)
+    cancelled = asyncio.Event()
+
+    async def _human(uin, phone, nickname):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "1111"
+
+    async def _bot(uin, phone, nickname):
+        await asyncio.sleep(0.05)
+        return "2222"
+
+    hook.add_impl(_human)
+    hook.add_impl(_bot)
+    start = time()
+    assert await race(hook, bool, uin=1, phone="", nickname="") == "2222"
+    assert time() - start < 1
+    await asyncio.sleep(0)
+    assert cancelled.is_set()
+
+
+async def test_race_predicate():
+    hook = MT.sms_code_input.with_timeout(5)
+
+    async def _wrong(uin, phone, nickname):
+        return "1"
+
+    async def _bad(uin, phone, nickname):
+        raise ValueError
+
+    async def _right(uin, phone, nickname):
+        await asyncio.sleep(0.05)
+        return "123456"
+
+    for i in (_wrong, _bad, _right):
+        hook.add_impl(i)
+    pred = lambda c: c and len(c.strip()) >= 4
+    assert await race(hook, pred, uin=1, phone="", nickname="") == "123456"
+
+    hook = MT.sms_code_input.with_timeout(5)
+    hook.add_impl(_wrong)
+    assert await race(hook, pred, uin=1, phone="", nickname="") is None
+
+
+async def test_answer_timeout():
+    hook = MT.sms_code_input.with_timeout(5)
+
+    async def _slow(uin, phone, nickname):
+        await asyncio.sleep(1)
+        return "123456"
+
+    hook.add_impl(_slow)
+    for racing in (True, False):
+        kw = dict(uin=1, phone="", nickname="", racing=racing, timeout=0.1)
+        assert await asyncio.wait_for(answer(hook, bool, **kw), 0.5) is None